@@ -0,0 +1,63 @@
+"""Compare LocresFile.read against the field-by-field BinReader reader.
+
+    python benchmarks/bench_parse.py --namespaces 50 --keys 2000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from binsl import BinReader
+from corpus import generate
+
+from pylocres import LocresFile, LocresVersion
+
+
+def read_reference(path):
+    locres = LocresFile()
+    with BinReader(path) as BR:
+        locres.read_header(BR)
+        if locres.version >= LocresVersion.Compact:
+            locres.read_strings(BR)
+        locres.read_keys(BR)
+    return locres
+
+
+def read_bulk(path):
+    locres = LocresFile()
+    locres.read(path)
+    return locres
+
+
+def best_of(func, path, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--namespaces", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in LocresVersion:
+            path = str(Path(tmp) / f"{version.name}.locres")
+            generate(path, version, args.namespaces, args.keys)
+
+            reference = best_of(read_reference, path, args.repeat)
+            bulk = best_of(read_bulk, path, args.repeat)
+            print(
+                f"{version.name:<10} reference {reference * 1000:8.1f} ms"
+                f"  bulk {bulk * 1000:8.1f} ms  x{reference / bulk:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare the streaming .po conversions against the polib based ones.
+
+    python benchmarks/bench_po.py --namespaces 50 --keys 2000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import polib
+from corpus import generate
+
+from pylocres import Entry, LocresFile, LocresVersion, Namespace, iter_entries
+from pylocres import convert
+
+
+def to_po_polib(path, out):
+    pofile = polib.POFile()
+    for name, key, source_hash, translation in iter_entries(path):
+        pofile.append(polib.POEntry(msgctxt=f"{name},{key}", msgid=translation))
+    pofile.save(out)
+
+
+def from_po_polib(path, out):
+    locres = LocresFile()
+    for po_entry in polib.pofile(path):
+        name, key = po_entry.msgctxt.split(",", 1)
+        namespace = locres[name] or Namespace(name)
+        locres.add(namespace)
+        translation = po_entry.msgstr or po_entry.msgid
+        namespace.add(Entry(key, translation, po_entry.msgid, False))
+    locres.write(out)
+
+
+def best_of(func, repeat, *args):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--namespaces", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.locres")
+        po_path = str(Path(tmp) / "bench.po")
+        out_path = str(Path(tmp) / "bench_out.locres")
+        generate(path, LocresVersion.CityHash, args.namespaces, args.keys)
+        convert.locres_to_po(path, po_path)
+
+        cases = [
+            ("to_po", to_po_polib, convert.locres_to_po, path, po_path),
+            ("from_po", from_po_polib, convert.po_to_locres, po_path, out_path),
+        ]
+        for name, reference, streaming, source, out in cases:
+            polib_time = best_of(reference, args.repeat, source, out)
+            streaming_time = best_of(streaming, args.repeat, source, out)
+            print(
+                f"{name:<8} polib {polib_time * 1000:8.1f} ms"
+                f"  streaming {streaming_time * 1000:8.1f} ms"
+                f"  x{polib_time / streaming_time:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Synthetic .locres corpus generator for the benchmarks.
+
+    python benchmarks/corpus.py out.locres --version 3 --namespaces 100 --keys 5000
+"""
+import argparse
+import math
+import random
+import uuid
+
+from pylocres import LocresVersion, LocresWriter, entry_hash
+
+ASCII_WORDS = (
+    "the quest item sword shield open close start game level enemy player "
+    "gold health mana save load settings audio video return continue press "
+    "button to select back confirm cancel inventory map objective complete"
+).split()
+
+NON_ASCII_WORDS = (
+    "гра меч щит відкрити закрити почати рівень ворог гравець золото "
+    "Spiel Schwert Schild öffnen schließen Gegenstand 剣 盾 開く 閉じる"
+).split()
+
+
+def make_translation(rng, mean_length, non_ascii):
+    length = max(1, int(rng.lognormvariate(math.log(mean_length), 0.6)))
+    words = NON_ASCII_WORDS if rng.random() < non_ascii else ASCII_WORDS
+    parts = []
+    size = 0
+    while size < length:
+        word = rng.choice(words)
+        parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)[:length]
+
+
+def generate(
+    path,
+    version=LocresVersion.CityHash,
+    namespaces=50,
+    keys=1000,
+    mean_length=40,
+    duplicate_ratio=0.2,
+    non_ascii=0.1,
+    seed=0,
+):
+    """Write a realistic .locres file and return the number of entries.
+
+    :param namespaces: Number of namespaces, the first one being the default ""
+    :param keys: Keys per namespace
+    :param mean_length: Mean translation length, lengths are log-normal
+    :param duplicate_ratio: Share of entries reusing an earlier translation
+    :param non_ascii: Share of translations that need UTF-16
+    """
+    rng = random.Random(seed)
+    pool = []
+
+    with LocresWriter(path, version) as writer:
+        for i in range(namespaces):
+            writer.begin_namespace("" if i == 0 else f"Namespace_{i}")
+            for j in range(keys):
+                if j % 2:
+                    key = uuid.UUID(int=rng.getrandbits(128)).hex.upper()
+                else:
+                    key = f"Key_{j}"
+
+                if pool and rng.random() < duplicate_ratio:
+                    translation = rng.choice(pool)
+                else:
+                    translation = make_translation(rng, mean_length, non_ascii)
+                    pool.append(translation)
+
+                writer.add(key, entry_hash(translation), translation)
+
+    return namespaces * keys
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--version", type=int, default=3, choices=range(4))
+    parser.add_argument("--namespaces", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--mean_length", type=int, default=40)
+    parser.add_argument("--duplicate_ratio", type=float, default=0.2)
+    parser.add_argument("--non_ascii", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    count = generate(
+        args.path,
+        LocresVersion(args.version),
+        args.namespaces,
+        args.keys,
+        args.mean_length,
+        args.duplicate_ratio,
+        args.non_ascii,
+        args.seed,
+    )
+    print(f"Wrote {count} entries to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark suite for pylocres.
+
+Generates a synthetic corpus for every LocresVersion and times reading,
+writing, round trips, hashing and the CLI conversions. Results are written
+as JSON so that runs can be compared:
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from corpus import generate
+
+from pylocres import LocresFile, LocresVersion, iter_entries
+from pylocres import convert
+from pylocres.city_hash import CityHash
+from pylocres.crc_hash import str_crc32_many
+
+
+def read(path, **kwargs):
+    locres = LocresFile()
+    locres.read(path, **kwargs)
+    return locres
+
+
+def benchmarks(path, tmp):
+    """Return ``(name, function)`` pairs to time against one corpus file."""
+    locres = read(path)
+    keys = [entry.key for namespace in locres for entry in namespace]
+    names = list(locres.namespaces)
+    csv_path = str(Path(tmp) / "bench.csv")
+    po_path = str(Path(tmp) / "bench.po")
+    out_path = str(Path(tmp) / "bench_out.locres")
+    convert.locres_to_csv(path, csv_path)
+    convert.locres_to_po(path, po_path)
+
+    def read_lazy():
+        with LocresFile() as lazy:
+            lazy.read(path, lazy=True)
+
+    def write_fresh():
+        # Fresh model every time, so no hash is reused from an earlier write
+        read(path).to_binary()
+
+    return [
+        ("read", lambda: read(path)),
+        ("read_lazy", read_lazy),
+        ("read_columnar", lambda: read(path, columnar=True)),
+        ("read_namespace", lambda: read(path, namespaces=[names[0]])),
+        ("iter_entries", lambda: sum(1 for _ in iter_entries(path))),
+        ("make_string_dict", locres.make_string_dict),
+        ("to_binary", locres.to_binary),
+        ("round_trip", write_fresh),
+        ("city_hash_many", lambda: CityHash.hash_many(keys)),
+        ("str_crc32_many", lambda: str_crc32_many(keys)),
+        ("to_csv", lambda: convert.locres_to_csv(path, csv_path)),
+        ("from_csv", lambda: convert.csv_to_locres(csv_path, out_path)),
+        ("to_po", lambda: convert.locres_to_po(path, po_path)),
+        ("from_po", lambda: convert.po_to_locres(po_path, out_path)),
+    ]
+
+
+def measure(function, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (r["version"], r["name"]): r["best"] for r in json.load(f)["results"]
+        }
+
+    print(f"\nCompared with {baseline_path}:")
+    for r in results:
+        before = baseline.get((r["version"], r["name"]))
+        if before:
+            print(
+                f"  {r['version']:<10} {r['name']:<18} "
+                f"{before * 1000:9.2f} -> {r['best'] * 1000:9.2f} ms"
+                f"  x{before / r['best']:.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--namespaces", type=int, default=20)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--mean_length", type=int, default=40)
+    parser.add_argument("--duplicate_ratio", type=float, default=0.2)
+    parser.add_argument("--non_ascii", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--versions", type=int, nargs="+", default=[int(v) for v in LocresVersion]
+    )
+    parser.add_argument("--filter", default="", help="Only run matching benchmarks.")
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="JSON results of an earlier run.")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in map(LocresVersion, args.versions):
+            path = str(Path(tmp) / f"{version.name}.locres")
+            entries = generate(
+                path,
+                version,
+                args.namespaces,
+                args.keys,
+                args.mean_length,
+                args.duplicate_ratio,
+                args.non_ascii,
+            )
+
+            for name, function in benchmarks(path, tmp):
+                if args.filter not in name:
+                    continue
+                best, mean = measure(function, args.repeat)
+                results.append(
+                    {
+                        "version": version.name,
+                        "name": name,
+                        "entries": entries,
+                        "best": best,
+                        "mean": mean,
+                    }
+                )
+                print(
+                    f"{version.name:<10} {name:<18} {best * 1000:9.2f} ms"
+                    f"  {entries / best / 1000:9.1f} k entries/s"
+                )
+
+    if args.output:
+        report = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "parameters": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
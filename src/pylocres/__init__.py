@@ -1,2 +1,17 @@
+from .cache import SnapshotCache
+from .collection import LocresCollection
+from .hash_index import LocresHashIndex
 from .locmeta import LocmetaFile, LocmetaVersion
-from .locres import Entry, LocresFile, LocresVersion, Namespace, entry_hash
+from .locres import (
+    ColumnarNamespace,
+    Entry,
+    LocresFile,
+    LocresVersion,
+    Namespace,
+    entry_hash,
+    entry_hash_many,
+)
+from .parser import iter_entries
+from .scan import LocresScan, scan
+from .stats import LocresStats
+from .writer import LocresWriter
@@ -0,0 +1,57 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+_executor: Executor | None = None
+# Whether _executor is the default pool created by get_executor()
+_owned = False
+
+
+def get_executor() -> Executor:
+    """Return the executor the async API runs blocking work on.
+
+    By default a thread pool bounded to ``min(4, cpu_count)`` workers,
+    created on first use.
+    """
+    global _executor, _owned
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            thread_name_prefix="pylocres",
+        )
+        _owned = True
+    return _executor
+
+
+def set_executor(executor: Executor | None):
+    """Use another executor for the async API, ``None`` restores the default.
+
+    The previous default pool is shut down without waiting for it, executors
+    set by the caller are left to the caller.
+    """
+    global _executor, _owned
+    if executor is _executor:
+        return
+    if _owned:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = executor
+    _owned = False
+
+
+async def run(function: Callable, *args, **kwargs):
+    """Run a blocking call on the executor without blocking the event loop.
+
+    Cancelling the awaiting task cancels the call if it has not started yet;
+    a call that is already running finishes and its result is dropped.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), partial(function, *args, **kwargs)
+    )
+
+
+def write_bytes(file, data: bytes):
+    with open(file, "wb") as f:
+        f.write(data)
@@ -0,0 +1,129 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from . import convert
+from .locres import LocresVersion
+
+# Conversion name -> (input suffix, output suffix)
+CONVERSIONS = {
+    "to-csv": (".locres", ".csv"),
+    "from-csv": (".csv", ".locres"),
+    "to-po": (".locres", ".po"),
+    "from-po": (".po", ".locres"),
+    "fix-hashes": (".locres", ".locres"),
+}
+
+
+class BatchResult(NamedTuple):
+    path: str
+    out: str
+    seconds: float
+    error: str | None = None
+
+
+def find_files(path: str | Path, suffix: str) -> list[Path]:
+    """Find the files to convert.
+
+    :param path: A directory (searched recursively), a glob pattern or a file
+    :param suffix: Suffix of the files to pick up in a directory or from a
+        glob pattern
+    """
+    path = str(path)
+    if os.path.isdir(path):
+        files = Path(path).rglob(f"*{suffix}")
+    elif glob.has_magic(path):
+        files = (
+            Path(p) for p in glob.glob(path, recursive=True) if p.endswith(suffix)
+        )
+    else:
+        files = [Path(path)]
+    return sorted(file for file in files if file.is_file())
+
+
+def _convert_one(mode, path, out, version, source_file) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        if mode == "to-csv":
+            convert.locres_to_csv(path, out)
+        elif mode == "from-csv":
+            convert.csv_to_locres(path, out, version)
+        elif mode == "to-po":
+            convert.locres_to_po(path, out)
+        elif mode == "from-po":
+            convert.po_to_locres(path, out, version)
+        else:
+            convert.fix_hashes(path, source_file, out)
+    except Exception as e:
+        return BatchResult(path, out, time.perf_counter() - start, str(e))
+    return BatchResult(path, out, time.perf_counter() - start)
+
+
+def convert_batch(
+    path: str | Path,
+    mode: str,
+    out_dir: str | Path | None = None,
+    jobs: int | None = None,
+    version: LocresVersion = LocresVersion.CityHash,
+    source_file: str | Path | None = None,
+    callback: Callable[[BatchResult], None] | None = None,
+) -> list[BatchResult]:
+    """Run one conversion over many files on a process pool.
+
+    :param path: A directory, a glob pattern or a single file
+    :param mode: One of :data:`CONVERSIONS`
+    :param out_dir: Directory to write the outputs to, keeping the layout
+        relative to the input; next to each input by default, as
+        ``<stem>.fixed.locres`` for ``fix-hashes``
+    :param jobs: Number of worker processes, all CPUs by default
+    :param version: Locres version for conversions that write .locres files
+    :param source_file: Source language .locres for ``fix-hashes``
+    :param callback: Called with each result as soon as its file is done
+    :return: A result per file, in input order
+    """
+    if mode not in CONVERSIONS:
+        raise ValueError(f"Unknown conversion: {mode}")
+    if mode == "fix-hashes" and source_file is None:
+        raise ValueError("fix-hashes needs a source_file")
+
+    in_suffix, out_suffix = CONVERSIONS[mode]
+    files = find_files(path, in_suffix)
+    if not files:
+        return []
+
+    root = Path(os.path.commonpath([file.parent for file in files]))
+    tasks = []
+    for file in files:
+        if out_dir is None and in_suffix == out_suffix:
+            # Never overwrite the inputs of fix-hashes
+            out = file.with_suffix(f".fixed{out_suffix}")
+        else:
+            out = file.with_suffix(out_suffix)
+        if out_dir is not None:
+            out = Path(out_dir) / out.relative_to(root)
+        if out.resolve() == file.resolve():
+            raise ValueError(f"Output would overwrite the input: {file}")
+        tasks.append((mode, str(file), str(out), version, source_file))
+
+    jobs = jobs or os.cpu_count() or 1
+    results = [None] * len(tasks)
+
+    if jobs == 1 or len(tasks) == 1:
+        for i, task in enumerate(tasks):
+            results[i] = _convert_one(*task)
+            if callback is not None:
+                callback(results[i])
+        return results
+
+    with ProcessPoolExecutor(min(jobs, len(tasks))) as executor:
+        futures = {executor.submit(_convert_one, *task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if callback is not None:
+                callback(result)
+    return results
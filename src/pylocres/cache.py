@@ -0,0 +1,295 @@
+import hashlib
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+
+from .locres import LocresFile
+from .parser import LocresVersion
+
+SNAPSHOT_MAGIC = b"PYLOCSN1"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# magic, file size, file mtime_ns, file digest, version,
+# string count, namespace count, entry count
+_HEADER = struct.Struct("<8sQq16sBIII")
+
+
+def file_digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _array(data: memoryview, count: int) -> array:
+    values = array("I")
+    values.frombytes(data[: count * 4])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _SnapshotKeys:
+    """Feeds snapshot records to :meth:`LocresFile.read_namespaces`."""
+
+    def __init__(self, version, strings, namespaces, entries):
+        self.version = version
+        self.strings = strings
+        self.namespaces = namespaces
+        self.entries = entries
+
+    def iter_namespaces(self, values: bool = True):
+        strings = self.strings
+        namespaces = self.namespaces
+        entries = self.entries
+        legacy = self.version == LocresVersion.Legacy
+        row = 0
+
+        for i in range(0, len(namespaces), 3):
+            name, namespace_hash, count = namespaces[i : i + 3]
+            start, end = row * 4, (row + count) * 4
+            translations = entries[start + 3 : end : 4]
+            if legacy:
+                translations = map(strings.__getitem__, translations)
+            keys = list(
+                zip(
+                    entries[start + 1 : end : 4],
+                    map(strings.__getitem__, entries[start:end:4]),
+                    entries[start + 2 : end : 4],
+                    translations,
+                )
+            )
+            row += count
+            yield namespace_hash, strings[name], keys
+
+
+class SnapshotCache:
+    """
+    Cache of parsed .locres files stored as compact binary snapshots.
+
+    A snapshot holds every distinct string once plus fixed-width namespace
+    and key records, and is loaded with a single read. It is used as long
+    as the file's size and mtime match. When only the mtime changed (e.g.
+    after a checkout) the content digest is compared instead, so the
+    snapshot stays valid for the same content.
+
+    Hits are loaded into ``ColumnarNamespace`` columns by default, which
+    skips building an ``Entry`` per key; with ``columnar=False`` a hit
+    saves little more than the string decoding of a parse.
+
+    ```python
+    cache = SnapshotCache(".locres_cache", max_size=256 * 1024 * 1024)
+    locres = cache.read("Game.locres")
+    ```
+
+    :param directory: Where to keep snapshots, or ``None`` to store them
+        next to each file as ``<file>.snapshot``
+    :param max_size: Total snapshot size in bytes kept in ``directory``,
+        the least recently used ones are evicted first
+    :param check_digest: Also compare the content digest on every load,
+        which reads and hashes the whole file on each hit
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_size: int = 512 * 1024 * 1024,
+        check_digest: bool = False,
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_size = max_size
+        self.check_digest = check_digest
+        self.hits = 0
+        self.misses = 0
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def snapshot_path(self, file: str | Path) -> Path:
+        """Return where the snapshot of a file is stored."""
+        file = Path(file).resolve()
+        if self.directory is None:
+            return file.with_name(file.name + SNAPSHOT_SUFFIX)
+        name = hashlib.blake2b(str(file).encode("utf-8"), digest_size=16).hexdigest()
+        return self.directory / (name + SNAPSHOT_SUFFIX)
+
+    def read(self, file: str | Path, columnar: bool = True) -> LocresFile:
+        """Load a .locres file from its snapshot, parsing and caching it on a miss.
+
+        :param file: Path to a .locres file
+        :param columnar: Store entries in ``ColumnarNamespace`` columns
+        """
+        stat = os.stat(file)
+        snapshot_path = self.snapshot_path(file)
+        data = None
+
+        try:
+            with open(snapshot_path, "rb") as f:
+                snapshot = f.read()
+        except FileNotFoundError:
+            snapshot = None
+
+        if snapshot is not None and len(snapshot) >= _HEADER.size:
+            magic, size, mtime, digest = _HEADER.unpack_from(snapshot)[:4]
+            if magic == SNAPSHOT_MAGIC and size == stat.st_size:
+                valid = mtime == stat.st_mtime_ns
+                if self.check_digest or not valid:
+                    with open(file, "rb") as f:
+                        data = f.read()
+                    valid = file_digest(data) == digest
+                if valid:
+                    try:
+                        locres = self.load_snapshot(snapshot, columnar)
+                    except (ValueError, IndexError):
+                        # Truncated or corrupt despite a valid header
+                        snapshot_path.unlink(missing_ok=True)
+                        locres = None
+                if valid and locres is not None:
+                    self.hits += 1
+                    if mtime != stat.st_mtime_ns:
+                        # Same content under a new mtime, keep the snapshot
+                        self._write(snapshot_path, snapshot, stat, digest)
+                    elif self.directory is not None:
+                        os.utime(snapshot_path)
+                    return locres
+
+        self.misses += 1
+        if data is None:
+            with open(file, "rb") as f:
+                data = f.read()
+
+        locres = LocresFile()
+        locres.read(data, columnar=columnar)
+        snapshot = self.make_snapshot(locres)
+        self._write(snapshot_path, snapshot, stat, file_digest(data))
+        return locres
+
+    def invalidate(self, file: str | Path | None = None):
+        """Remove the snapshot of a file, or every snapshot in the directory."""
+        if file is not None:
+            self.snapshot_path(file).unlink(missing_ok=True)
+        elif self.directory is not None:
+            for path in self.directory.glob("*" + SNAPSHOT_SUFFIX):
+                path.unlink(missing_ok=True)
+
+    def evict(self):
+        """Remove the least recently used snapshots above ``max_size``."""
+        if self.directory is None:
+            return
+        snapshots = []
+        for path in self.directory.glob("*" + SNAPSHOT_SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshots.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in snapshots)
+        for _, size, path in sorted(snapshots):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _write(self, path: Path, snapshot: bytes, stat, digest: bytes):
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            stat.st_size,
+            stat.st_mtime_ns,
+            digest,
+            *_HEADER.unpack_from(snapshot)[4:],
+        )
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(memoryview(snapshot)[_HEADER.size :])
+        os.replace(tmp, path)
+        self.evict()
+
+    @staticmethod
+    def make_snapshot(locres: LocresFile) -> bytes:
+        """Serialize a file object; the header's file fields are left empty."""
+        hashed = locres.version >= LocresVersion.Optimized
+        if hashed:
+            locres.update_hashes()
+
+        strings: dict[str, int] = {}
+        namespaces = array("I")
+        entries = array("I")
+
+        for namespace in locres:
+            name = strings.setdefault(namespace.name, len(strings))
+            namespace_hash = namespace._name_hash if hashed else 0
+            namespaces.extend((name, namespace_hash, len(namespace)))
+            for entry in namespace:
+                key = strings.setdefault(entry.key, len(strings))
+                translation = strings.setdefault(entry.translation, len(strings))
+                key_hash = entry._key_hash if hashed else 0
+                entries.extend((key, key_hash, int(entry.hash), translation))
+
+        offsets = array("I", [0])
+        position = 0
+        for string in strings:
+            position += len(string)
+            offsets.append(position)
+
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            0,
+            0,
+            bytes(16),
+            locres.version,
+            len(strings),
+            len(namespaces) // 3,
+            len(entries) // 4,
+        )
+        text = "".join(strings).encode("utf-8", "surrogatepass")
+        return b"".join(
+            (
+                header,
+                _to_bytes(offsets),
+                _to_bytes(namespaces),
+                _to_bytes(entries),
+                text,
+            )
+        )
+
+    @staticmethod
+    def load_snapshot(snapshot: bytes, columnar: bool = True) -> LocresFile:
+        """Build a file object from a snapshot."""
+        header = _HEADER.unpack_from(snapshot)
+        if header[0] != SNAPSHOT_MAGIC:
+            raise ValueError("Not a pylocres snapshot.")
+        version, string_count, namespace_count, entry_count = header[4:]
+
+        view = memoryview(snapshot)
+        pos = _HEADER.size
+        offsets = _array(view[pos:], string_count + 1)
+        pos += len(offsets) * 4
+        namespaces = _array(view[pos:], namespace_count * 3)
+        pos += len(namespaces) * 4
+        entries = _array(view[pos:], entry_count * 4)
+        pos += len(entries) * 4
+        if len(offsets) + len(namespaces) + len(entries) != (
+            string_count + 1 + namespace_count * 3 + entry_count * 4
+        ):
+            raise ValueError("Truncated pylocres snapshot.")
+
+        text = bytes(view[pos:]).decode("utf-8", "surrogatepass")
+        if len(text) != offsets[-1]:
+            raise ValueError("Truncated pylocres snapshot.")
+        strings = list(map(text.__getitem__, map(slice, offsets, offsets[1:])))
+
+        locres = LocresFile()
+        locres.version = LocresVersion(version)
+        locres._strings = strings
+        keys = _SnapshotKeys(locres.version, strings, namespaces, entries)
+        locres.read_namespaces(keys, None, columnar)
+        return locres
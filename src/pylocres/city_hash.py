@@ -1,6 +1,6 @@
 import struct
 from functools import singledispatch
-from typing import List, Tuple, Union
+from typing import Iterable, List, Tuple, Union
 
 # Constants
 K0 = 0xc3a5c85c97cb3127
@@ -210,9 +210,37 @@ class CityHash:
         r = CityHash._uint32((h & 0xFFFFFFFF) + (((h >> 32) & 0xFFFFFFFF) * 23))
         return r
     
+    @staticmethod
+    def hash_many(strings: Iterable[str]) -> List[int]:
+        """Compute :meth:`city_hash_64_utf16_to_uint32` for every string.
+
+        Repeated strings are only hashed once, which is common for key names
+        shared between namespaces.
+        """
+        cache = {"": 0}
+        result = []
+        append = result.append
+
+        for s in strings:
+            r = cache.get(s)
+            if r is None:
+                h = _city_hash_64(s.encode('utf-16le'))
+                r = ((h & 0xFFFFFFFF) + (h >> 32) * 23) & 0xFFFFFFFF
+                cache[s] = r
+            append(r)
+        return result
+
     @staticmethod
     def city_hash_64(s: str) -> int:
         """Compute a 64-bit hash from a string."""
+        return _city_hash_64(s.encode('utf-16le'))
+
+    @staticmethod
+    def city_hash_64_reference(s: str) -> int:
+        """Compute a 64-bit hash from a string using the step helpers.
+
+        Slow reference for :meth:`city_hash_64`, kept to verify it against.
+        """
         data = s.encode('utf-16le')
         length = len(data)
         
@@ -260,4 +288,185 @@ class CityHash:
         return CityHash.hash_len16(
             CityHash.hash_len16(v[0], w[0]) + CityHash.shift_mix(y) * K1 + z,
             CityHash.hash_len16(v[1], w[1]) + x
-        )
\ No newline at end of file
+        )
+
+
+_M64 = 0xFFFFFFFFFFFFFFFF
+_U32 = struct.Struct('<I').unpack_from
+_U64 = struct.Struct('<Q').unpack_from
+_U64x2 = struct.Struct('<2Q').unpack_from
+_U64x4 = struct.Struct('<4Q').unpack_from
+_U64x8 = struct.Struct('<8Q').unpack_from
+
+
+def _city_hash_64(data: bytes) -> int:
+    """CityHash64 of raw bytes, with every step inlined into local variables.
+
+    Values are only masked to 64 bits where a shift or rotation needs it;
+    additions and multiplications are allowed to grow and are masked once
+    the result is consumed.
+    """
+    length = len(data)
+
+    if length <= 16:
+        if length >= 8:
+            mul = K2 + length * 2
+            a = _U64(data, 0)[0] + K2
+            b = _U64(data, length - 8)[0]
+            c = (((b >> 37) | (b << 27)) * mul + a) & _M64
+            a &= _M64
+            d = ((((a >> 25) | (a << 39)) & _M64) + b) * mul & _M64
+            a = (c ^ d) * mul & _M64
+            a ^= a >> 47
+            b = (d ^ a) * mul & _M64
+            b ^= b >> 47
+            return b * mul & _M64
+
+        if length >= 4:
+            mul = K2 + length * 2
+            u = length + (_U32(data, 0)[0] << 3)
+            v = _U32(data, length - 4)[0]
+            a = (u ^ v) * mul & _M64
+            a ^= a >> 47
+            b = (v ^ a) * mul & _M64
+            b ^= b >> 47
+            return b * mul & _M64
+
+        if length > 0:
+            y = data[0] + (data[length >> 1] << 8)
+            z = length + (data[length - 1] << 2)
+            h = ((y * K2) ^ (z * K0)) & _M64
+            return (h ^ (h >> 47)) * K2 & _M64
+
+        return K2
+
+    mul = K2 + length * 2
+
+    if length <= 32:
+        w0, w1 = _U64x2(data, 0)
+        w2, w3 = _U64x2(data, length - 16)
+        a = w0 * K1 & _M64
+        c = w3 * mul & _M64
+        d = w2 * K2 & _M64
+        u = (a + w1) & _M64
+        u = ((u >> 43) | (u << 21)) & _M64
+        u += ((c >> 30) | (c << 34)) & _M64
+        u += d
+        v = (w1 + K2) & _M64
+        v = a + (((v >> 18) | (v << 46)) & _M64) + c
+        a = (u ^ v) * mul & _M64
+        a ^= a >> 47
+        b = (v ^ a) * mul & _M64
+        b ^= b >> 47
+        return b * mul & _M64
+
+    if length <= 64:
+        w0, w1, w2, w3 = _U64x4(data, 0)
+        t0, t1, t2, t3 = _U64x4(data, length - 32)
+        a = w0 * K2 & _M64
+        b = w1
+        c = t1
+        d = t0
+        e = w2 * K2 & _M64
+        f = w3 * 9 & _M64
+        g = t3
+        h = t2 * mul & _M64
+
+        ag = (a + g) & _M64
+        u = (((ag >> 43) | (ag << 21)) + ((((b >> 30) | (b << 34)) & _M64) + c) * 9) & _M64
+        v = (ag ^ d) + f + 1
+        w = (int.from_bytes(((u + v) * mul & _M64).to_bytes(8, 'little'), 'big') + h) & _M64
+        ef = (e + f) & _M64
+        x = ((((ef >> 42) | (ef << 22)) & _M64) + c) & _M64
+        y = (int.from_bytes(((v + w) * mul & _M64).to_bytes(8, 'little'), 'big') + g) * mul
+        z = (e + f + c) & _M64
+        a = (int.from_bytes(((x + z) * mul + y & _M64).to_bytes(8, 'little'), 'big') + b) & _M64
+        b = ((z + a) * mul + d + h) & _M64
+        b = (b ^ (b >> 47)) * mul & _M64
+        return (b + x) & _M64
+
+    # Seeds from the last 64 bytes
+    t0, t1, t2, t3, t4, t5, t6, t7 = _U64x8(data, length - 64)
+    x = t3
+    y = t6 + t1
+    u = (t2 + length) & _M64
+    a = (u ^ t5) * HASH_MUL & _M64
+    a ^= a >> 47
+    b = (t5 ^ a) * HASH_MUL & _M64
+    b ^= b >> 47
+    z = b * HASH_MUL & _M64
+
+    # v = WeakHashLen32WithSeeds(data[-64:], length, z)
+    a = length + t0
+    b = (z + a + t3) & _M64
+    b = (b >> 21) | (b << 43)
+    c = a
+    a += t1 + t2
+    a &= _M64
+    v0 = (a + t3) & _M64
+    v1 = (b + ((a >> 44) | (a << 20)) + c) & _M64
+
+    # w = WeakHashLen32WithSeeds(data[-32:], y + K1, x)
+    a = (y + K1 + t4) & _M64
+    b = (x + a + t7) & _M64
+    b = (b >> 21) | (b << 43)
+    c = a
+    a = (a + t5 + t6) & _M64
+    w0 = (a + t7) & _M64
+    w1 = (b + ((a >> 44) | (a << 20)) + c) & _M64
+
+    x = (x * K1 + _U64(data, 0)[0]) & _M64
+    y &= _M64
+
+    offset = 0
+    end = (length - 1) & ~63
+    while offset != end:
+        d0, d1, d2, d3, d4, d5, d6, d7 = _U64x8(data, offset)
+
+        x = (x + y + v0 + d1) & _M64
+        x = ((x >> 37) | (x << 27)) * K1 & _M64
+        y = (y + v1 + d6) & _M64
+        y = ((y >> 42) | (y << 22)) * K1 & _M64
+        x ^= w1
+        y = (y + v0 + d5) & _M64
+        z = (z + w0) & _M64
+        z = ((z >> 33) | (z << 31)) * K1 & _M64
+
+        # v = WeakHashLen32WithSeeds(chunk[0:32], v1 * K1, x + w0)
+        a = v1 * K1 + d0
+        b = (x + w0 + a + d3) & _M64
+        b = (b >> 21) | (b << 43)
+        c = a
+        a = (a + d1 + d2) & _M64
+        v0 = (a + d3) & _M64
+        v1 = (b + ((a >> 44) | (a << 20)) + c) & _M64
+
+        # w = WeakHashLen32WithSeeds(chunk[32:64], z + w1, y + d2)
+        a = z + w1 + d4
+        b = (y + d2 + a + d7) & _M64
+        b = (b >> 21) | (b << 43)
+        c = a
+        a = (a + d5 + d6) & _M64
+        w0 = (a + d7) & _M64
+        w1 = (b + ((a >> 44) | (a << 20)) + c) & _M64
+
+        z, x = x, z
+        offset += 64
+
+    a = (v0 ^ w0) * HASH_MUL & _M64
+    a ^= a >> 47
+    b = (w0 ^ a) * HASH_MUL & _M64
+    b ^= b >> 47
+    u = (b * HASH_MUL + (y ^ (y >> 47)) * K1 + z) & _M64
+
+    a = (v1 ^ w1) * HASH_MUL & _M64
+    a ^= a >> 47
+    b = (w1 ^ a) * HASH_MUL & _M64
+    b ^= b >> 47
+    v = (b * HASH_MUL + x) & _M64
+
+    a = (u ^ v) * HASH_MUL & _M64
+    a ^= a >> 47
+    b = (v ^ a) * HASH_MUL & _M64
+    b ^= b >> 47
+    return b * HASH_MUL & _M64
@@ -1,38 +1,108 @@
-import csv
+import time
+from pathlib import Path
 
 import click
-import polib
 
-from .locres import Entry, LocresFile, LocresVersion, Namespace
+from . import convert, diff as diff_engine
+from .batch import CONVERSIONS, convert_batch, find_files
+from .scan import scan
+from .stats import LocresStats
+from .verify import verify_batch
 
 
 @click.group()
 @click.version_option("0.1.9.2", prog_name="pylocres")
-def cli():
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print the time and size of every read/write phase.",
+)
+@click.pass_context
+def cli(ctx, profile):
     """🗂️  pylocres - A CLI tool for working with Unreal Engine .locres files"""
-    pass
+    if profile:
+        stats = LocresStats()
+        ctx.obj = stats
+        ctx.call_on_close(lambda: click.echo(stats.report(), err=True))
+
+
+def get_stats() -> LocresStats | None:
+    """Return the stats collected for ``--profile``, if it was given."""
+    return click.get_current_context().find_root().obj
 
 
-@cli.command("info", help="📄 Display metadata about the given .locres file.")
+@cli.command("info", help="📄 Display metadata about the given .locres file(s).")
 @click.option(
     "--path",
     "-p",
-    type=click.Path(exists=True),
     required=True,
-    help="Path to the .locres file.",
+    help="A .locres file, or a directory (searched recursively) or glob pattern.",
+)
+@click.option(
+    "--stats",
+    "-s",
+    is_flag=True,
+    help="Also report string table size, dedup ratio, encodings and largest strings.",
 )
-def info(path):
+def info(path, stats):
     try:
-        locres = LocresFile()
-        locres.read(path)
+        files = find_files(path, ".locres")
+        if not files:
+            raise ValueError(f"No .locres files found at {path}")
+
+        if len(files) > 1:
+            start = time.perf_counter()
+            entries = 0
+            for file in files:
+                try:
+                    result = scan(file)
+                except Exception as e:
+                    click.secho(f"❌ {file}: {e}", err=True, fg="red")
+                    continue
+                entries += result.entries
+                click.echo(
+                    f"{result.path}: v{int(result.version)}, "
+                    f"{result.namespaces} namespaces, {result.entries} entries, "
+                    f"{result.strings} strings"
+                )
+            click.secho(
+                f"📊 {len(files)} files, {entries} entries scanned in "
+                f"{time.perf_counter() - start:.2f} s.",
+                fg="cyan",
+            )
+            return
+
+        profile = get_stats()
+        if profile is not None:
+            start = profile.start()
+        result = scan(files[0], stats)
+        if profile is not None:
+            profile.record("scan", start, result.size)
 
         click.secho(
-            f"📦 Locres version: {locres.version} ({locres.version.name})", fg="green"
+            f"📦 Locres version: {result.version} ({result.version.name})", fg="green"
         )
-        click.secho(f"📚 Namespace count: {len(locres.namespaces)}", fg="green")
+        click.secho(f"📚 Namespace count: {result.namespaces}", fg="green")
+        click.secho(f"📝 Entries count: {result.entries}", fg="green")
+        if result.string_stats is None:
+            return
+
+        strings = result.string_stats
+        total = strings.ascii + strings.utf16
+        share = strings.ascii / total * 100 if total else 100.0
         click.secho(
-            f"📝 Entries count: {sum(len(ns) for ns in locres.namespaces)}", fg="green"
+            f"🧵 Strings: {result.strings} ({strings.size} bytes), "
+            f"dedup ratio {result.dedup_ratio:.2f}",
+            fg="green",
         )
+        click.secho(
+            f"🔤 ASCII: {strings.ascii} ({strings.ascii_bytes} bytes, {share:.1f}%), "
+            f"UTF-16: {strings.utf16} ({strings.utf16_bytes} bytes)",
+            fg="green",
+        )
+        for characters, text in strings.largest:
+            preview = text if len(text) <= 60 else text[:57] + "..."
+            click.echo(f"   {characters:>8} chars: {preview!r}")
     except Exception as e:
         click.secho(f"❌ Failed to read .locres file: {e}", err=True, fg="red")
 
@@ -54,18 +124,7 @@ def info(path):
 )
 def to_csv(path, out):
     try:
-        locres = LocresFile()
-        locres.read(path)
-
-        with open(out, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["key", "hash", "source", "translation"])
-
-            for namespace in locres:
-                for entry in namespace:
-                    writer.writerow(
-                        [f"{namespace.nam},{entry.key}", entry.hash, entry.translation]
-                    )
+        convert.locres_to_csv(path, out, get_stats())
 
         click.secho(f"✅ CSV exported successfully to {out}", fg="green")
     except Exception as e:
@@ -92,27 +151,15 @@ def to_csv(path, out):
 @click.option(
     "--ver", "-v", type=click.IntRange(0, 3), default=3, help="Locres version (0-3)."
 )
-def from_csv(path, out, ver):
+@click.option(
+    "--grouped",
+    "-g",
+    is_flag=True,
+    help="Rows of each namespace are contiguous; hold one namespace at a time.",
+)
+def from_csv(path, out, ver, grouped):
     try:
-        locres = LocresFile()
-        locres.version = LocresVersion(ver)
-
-        with open(path, "r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-
-            for row in reader:
-                name_and_key = row.get("key")
-                name = name_and_key.split(",", 1)[0]
-                key = name_and_key.split(",", 1)[1]
-                source_hash = row.get("hash")
-                source = row.get("source") or ""
-                translation = row.get("translation") or source
-
-                namespace = locres[name] or Namespace(name)
-                locres.add(namespace)
-                namespace.add(Entry(key, translation, source_hash))
-
-        locres.write(out)
+        convert.csv_to_locres(path, out, ver, get_stats(), grouped)
         click.secho(f"✅ Locres file created at {out}", fg="green")
     except Exception as e:
         click.secho(f"❌ Error: {e}", err=True, fg="red")
@@ -131,19 +178,8 @@ def from_csv(path, out, ver):
 )
 def to_po(path, out):
     try:
-        locres = LocresFile()
-        locres.read(path)
+        convert.locres_to_po(path, out, get_stats())
 
-        pofile = polib.POFile()
-
-        for namespace in locres:
-            for entry in namespace:
-                po_entry = polib.POEntry(
-                    msgctxt=f"{namespace.name},{entry.key}", msgid=entry.translation
-                )
-                pofile.append(po_entry)
-
-        pofile.save(out)
         click.secho(f"✅ PO file exported to {out}", fg="green")
     except Exception as e:
         click.secho(f"❌ Error: {e}", err=True, fg="red")
@@ -167,29 +203,21 @@ def to_po(path, out):
 @click.option(
     "--ver", "-v", type=click.IntRange(0, 3), default=3, help="Locres version (0-3)."
 )
-def from_po(path, out, ver):
+@click.option(
+    "--grouped",
+    "-g",
+    is_flag=True,
+    help="Messages of each namespace are contiguous; hold one namespace at a time.",
+)
+def from_po(path, out, ver, grouped):
     try:
-        locres = LocresFile()
-        locres.version = LocresVersion(ver)
-
-        pofile = polib.pofile(path)
-        for po_entry in pofile:
-            try:
-                name, key = po_entry.msgctxt.split(",", 1)
-            except ValueError:
-                click.secho(
-                    f"⚠️ Skipping entry with invalid msgctxt: {po_entry.msgctxt}",
-                    fg="yellow",
-                )
-                continue
-
-            namespace = locres[name] or Namespace(name)
-            locres.add(namespace)
-
-            translation = po_entry.msgstr or po_entry.msgid
-            namespace.add(Entry(key, translation, po_entry.msgid, False))
+        skipped = convert.po_to_locres(path, out, ver, get_stats(), grouped)
+        for msgctxt in skipped:
+            click.secho(
+                f"⚠️ Skipping entry with invalid msgctxt: {msgctxt}",
+                fg="yellow",
+            )
 
-        locres.write(out)
         click.secho(f"✅ Locres file created at {out}", fg="green")
     except Exception as e:
         click.secho(f"❌ Error: {e}", err=True, fg="red")
@@ -223,38 +251,192 @@ def from_po(path, out, ver):
 def fix_hashes(path, source_file, out):
     """Fixes hashes in the modified locres file using those from the source."""
     try:
-        source_locres = LocresFile()
-        source_locres.read(source_file)
+        fixed, total = convert.fix_hashes(path, source_file, out, get_stats())
+
+        click.secho(f"✅ Hashes fixed: {fixed} of {total} entries updated.", fg="green")
+        click.secho(f"📁 Output saved to: {out}", fg="cyan")
+
+    except Exception as e:
+        click.secho(f"❌ Error: {e}", fg="red", err=True)
+
+
+@cli.command(
+    "batch", help="🗃️  Run a conversion over every matching file in parallel."
+)
+@click.argument("mode", type=click.Choice(list(CONVERSIONS)))
+@click.option(
+    "--path",
+    "-p",
+    required=True,
+    help="Directory to search recursively, glob pattern or single file.",
+)
+@click.option(
+    "--out_dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Output directory (defaults to next to each input, as <stem>.fixed.locres "
+    "for fix-hashes).",
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(1), default=None, help="Worker processes."
+)
+@click.option(
+    "--ver", "-v", type=click.IntRange(0, 3), default=3, help="Locres version (0-3)."
+)
+@click.option(
+    "--source_file",
+    "-s",
+    type=click.Path(exists=True),
+    default=None,
+    help="Original source .locres file for fix-hashes.",
+)
+def batch(mode, path, out_dir, jobs, ver, source_file):
+    def report(result):
+        if result.error is None:
+            click.secho(
+                f"✅ {result.path} -> {result.out} ({result.seconds * 1000:.0f} ms)",
+                fg="green",
+            )
+        else:
+            click.secho(f"❌ {result.path}: {result.error}", err=True, fg="red")
+
+    try:
+        start = time.perf_counter()
+        results = convert_batch(
+            path, mode, out_dir, jobs, ver, source_file, callback=report
+        )
+        elapsed = time.perf_counter() - start
 
-        mod_locres = LocresFile()
-        mod_locres.read(path)
+        failed = sum(result.error is not None for result in results)
+        busy = sum(result.seconds for result in results)
+        click.secho(
+            f"📊 {len(results) - failed} of {len(results)} files converted in "
+            f"{elapsed:.2f} s ({busy:.2f} s of conversion work).",
+            fg="cyan",
+        )
+    except Exception as e:
+        click.secho(f"❌ Error: {e}", err=True, fg="red")
 
-        fixed = 0
-        total = 0
 
-        for mod_ns in mod_locres:
-            src_ns = (
-                source_locres[mod_ns.name] if mod_ns.name in source_locres else None
+@cli.command(
+    "verify", help="🔍 Check namespace/key hashes and, optionally, source hashes."
+)
+@click.option(
+    "--path",
+    "-p",
+    required=True,
+    help="Directory to search recursively, glob pattern or single .locres file.",
+)
+@click.option(
+    "--source_file",
+    "-s",
+    type=click.Path(exists=True),
+    default=None,
+    help="Source language .locres the source hashes should match.",
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(1), default=None, help="Worker processes."
+)
+@click.option(
+    "--limit",
+    "-l",
+    type=click.IntRange(0),
+    default=20,
+    help="Problems to list per file (0 for all).",
+)
+def verify(path, source_file, jobs, limit):
+    def report(result):
+        if result.error is not None:
+            click.secho(f"❌ {result.path}: {result.error}", err=True, fg="red")
+            return
+        if result.ok:
+            click.secho(
+                f"✅ {result.path}: {result.entries} entries OK "
+                f"({result.seconds * 1000:.0f} ms)",
+                fg="green",
             )
-            if not src_ns:
-                continue
+            return
 
-            src_entries_by_key = {e.key: e for e in src_ns}
+        click.secho(
+            f"❌ {result.path}: {len(result.mismatches)} mismatches, "
+            f"{len(result.collisions)} collisions",
+            err=True,
+            fg="red",
+        )
+        problems = []
+        for m in result.mismatches:
+            where = m.namespace if m.key is None else f"{m.namespace},{m.key}"
+            problems.append(
+                f"   {m.kind} hash {m.stored:#010x} != {m.expected:#010x}: {where}"
+            )
+        for c in result.collisions:
+            if c.key is None:
+                where = f"namespaces {c.namespace!r} and {c.other!r}"
+            else:
+                where = f"keys {c.key!r} and {c.other!r} in {c.namespace!r}"
+            problems.append(f"   collision {c.hash:#010x}: {where}")
+
+        for line in problems[: limit or None]:
+            click.secho(line, err=True, fg="yellow")
+        if limit and len(problems) > limit:
+            click.secho(f"   ... {len(problems) - limit} more", err=True, fg="yellow")
 
-            for mod_entry in mod_ns:
-                total += 1
-                src_entry = src_entries_by_key.get(mod_entry.key)
-                if src_entry and mod_entry.hash != src_entry.hash:
-                    mod_entry.hash = src_entry.hash
-                    fixed += 1
+    try:
+        results = verify_batch(path, source_file, jobs, callback=report)
+    except Exception as e:
+        click.secho(f"❌ Error: {e}", err=True, fg="red")
+        raise SystemExit(1)
 
-        mod_locres.write(out)
+    failed = sum(not result.ok for result in results)
+    click.secho(
+        f"📊 {len(results) - failed} of {len(results)} files passed.",
+        fg="cyan" if not failed else "red",
+    )
+    if failed or not results:
+        raise SystemExit(1)
 
-        click.secho(f"✅ Hashes fixed: {fixed} of {total} entries updated.", fg="green")
-        click.secho(f"📁 Output saved to: {out}", fg="cyan")
 
+@cli.command("diff", help="🆚 Show added, removed and changed keys between two files.")
+@click.option(
+    "--old", "-a", type=click.Path(exists=True), required=True, help="Older .locres."
+)
+@click.option(
+    "--new", "-b", type=click.Path(exists=True), required=True, help="Newer .locres."
+)
+@click.option(
+    "--out",
+    "-o",
+    type=click.Path(),
+    default=None,
+    help="Write the changes to a .json or .csv file instead of printing them.",
+)
+def diff(old, new, out):
+    try:
+        changes = diff_engine.diff_files(old, new)
+
+        if out is None:
+            for change in changes:
+                click.echo(
+                    f"{change.change:<8} {change.namespace},{change.key}: "
+                    f"{change.old_translation!r} -> {change.new_translation!r}"
+                )
+        elif Path(out).suffix.lower() == ".csv":
+            diff_engine.write_csv(changes, out)
+        else:
+            diff_engine.write_json(changes, out)
+
+        counts = {kind: 0 for kind in ["added", "removed", "changed", "source"]}
+        for change in changes:
+            counts[change.change] += 1
+        click.secho(
+            "📊 "
+            + ", ".join(f"{count} {kind}" for kind, count in counts.items())
+            + (f" -> {out}" if out else ""),
+            fg="cyan",
+        )
     except Exception as e:
-        click.secho(f"❌ Error: {e}", fg="red", err=True)
+        click.secho(f"❌ Error: {e}", err=True, fg="red")
 
 
 if __name__ == "__main__":
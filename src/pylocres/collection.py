@@ -0,0 +1,293 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+from .city_hash import CityHash
+from .crc_hash import str_crc32_many
+from .locmeta import LocmetaFile
+from .locres import Entry, LocresFile, Namespace
+from .parser import LocresParser, LocresVersion
+from .writer import LocresWriter
+
+
+def _load_culture(file: str | Path) -> tuple[LocresVersion, list]:
+    """Return the version and ``(name_hash, name, keys)`` namespaces of a file."""
+    with LocresParser.from_file(file) as parser:
+        strings = None
+        if parser.version >= LocresVersion.Compact:
+            strings = parser.read_strings()
+
+        namespaces = []
+        for name_hash, name, keys in parser.iter_namespaces():
+            if strings is not None:
+                keys = [
+                    (key_hash, key, source_hash, strings[index])
+                    for key_hash, key, source_hash, index in keys
+                ]
+            namespaces.append((name_hash, name, keys))
+        return parser.version, namespaces
+
+
+class LocresCollection:
+    """
+    The .locres files of every culture of a localization target.
+
+    Namespaces and keys are stored once and shared by all cultures, each
+    culture only adds a translation column and a source hash column.
+
+    ```python
+    collection = LocresCollection.from_locmeta("Localization/Game/Game.locmeta")
+    print(collection["UI", "PlayButton", "uk"])
+    collection.write_all("out/Game")
+    ```
+    """
+
+    def __init__(self, version: LocresVersion = LocresVersion.CityHash):
+        self.version = LocresVersion(version)
+        self.native_culture = None
+        self.file_name = "Game.locres"
+
+        # namespace -> key -> row
+        self._namespaces: dict[str, dict[str, int]] = {}
+        self._rows = 0
+        self._translations: dict[str, list[str | None]] = {}
+        self._hashes: dict[str, array] = {}
+
+        # Hashes of the namespaces and keys, valid for _hash_version
+        self._name_hashes: dict[str, int] = {}
+        self._key_hashes = array("I")
+        self._hash_version = None
+
+    @classmethod
+    def from_locmeta(
+        cls,
+        locmeta: LocmetaFile | str | Path,
+        directory: str | Path | None = None,
+        jobs: int | None = None,
+    ) -> "LocresCollection":
+        """Load every compiled culture of a localization target in parallel.
+
+        Culture files are read from ``<directory>/<culture>/<file name>``, the
+        file name being the one of ``native_locres``.
+
+        :param locmeta: A .locmeta file or its path
+        :param directory: The localization target directory, by default the
+            one holding the .locmeta file
+        :param jobs: Number of worker processes, 1 loads in this process
+        """
+        if not isinstance(locmeta, LocmetaFile):
+            path = Path(locmeta)
+            locmeta = LocmetaFile()
+            locmeta.read(str(path))
+            if directory is None:
+                directory = path.parent
+        elif directory is None:
+            raise ValueError("directory is required when passing a LocmetaFile")
+
+        collection = cls()
+        collection.native_culture = locmeta.native_culture
+        collection.file_name = Path(locmeta.native_locres).name
+
+        cultures = list(locmeta.compiled_cultures or [locmeta.native_culture])
+        if locmeta.native_culture in cultures:
+            # Native first, so that its namespace and key order is kept
+            cultures.remove(locmeta.native_culture)
+            cultures.insert(0, locmeta.native_culture)
+        files = [
+            Path(directory) / culture / collection.file_name for culture in cultures
+        ]
+
+        if jobs == 1:
+            loaded = map(_load_culture, files)
+            for culture, (version, namespaces) in zip(cultures, loaded):
+                collection._merge(culture, version, namespaces)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                loaded = executor.map(_load_culture, files)
+                for culture, (version, namespaces) in zip(cultures, loaded):
+                    collection._merge(culture, version, namespaces)
+        return collection
+
+    @property
+    def cultures(self) -> list[str]:
+        return list(self._translations)
+
+    def __len__(self) -> int:
+        """Return the number of distinct namespace/key pairs"""
+        return self._rows
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        for name, rows in self._namespaces.items():
+            for key in rows:
+                yield name, key
+
+    def __contains__(self, index) -> bool:
+        name, key = index[:2]
+        rows = self._namespaces.get(name)
+        return rows is not None and key in rows
+
+    def __getitem__(self, index) -> str | None:
+        """Return the translation of ``collection[namespace, key, culture]``"""
+        name, key, culture = index
+        try:
+            return self._translations[culture][self._namespaces[name][key]]
+        except KeyError:
+            return None
+
+    def __setitem__(self, index, translation: str):
+        name, key, culture = index
+        self.set(name, key, culture, translation)
+
+    def add_culture(self, culture: str, file: str | Path):
+        """Load one more culture from a .locres file."""
+        self._merge(culture, *_load_culture(file))
+
+    def source_hash(self, name: str, key: str, culture: str) -> int | None:
+        try:
+            row = self._namespaces[name][key]
+            if self._translations[culture][row] is None:
+                return None
+            return self._hashes[culture][row]
+        except KeyError:
+            return None
+
+    def set(
+        self,
+        name: str,
+        key: str,
+        culture: str,
+        translation: str,
+        source_hash: int | None = None,
+    ):
+        """Set a translation, adding the culture and the key when they are new.
+
+        Without ``source_hash`` the entry keeps its hash, or takes the one
+        another culture has for the same key.
+        """
+        if culture not in self._translations:
+            self._translations[culture] = [None] * self._rows
+            self._hashes[culture] = array("I", bytes(4 * self._rows))
+
+        rows = self._namespaces.get(name)
+        if rows is None:
+            rows = self._namespaces[name] = {}
+            self._hash_version = None
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = self._add_row(0)
+            self._hash_version = None
+
+        translations = self._translations[culture]
+        if source_hash is None:
+            if translations[row] is not None:
+                source_hash = self._hashes[culture][row]
+            else:
+                source_hash = next(
+                    (
+                        self._hashes[other][row]
+                        for other in self._translations
+                        if self._translations[other][row] is not None
+                    ),
+                    0,
+                )
+        translations[row] = translation
+        self._hashes[culture][row] = int(source_hash)
+
+    def _add_row(self, key_hash: int) -> int:
+        for translations in self._translations.values():
+            translations.append(None)
+        for hashes in self._hashes.values():
+            hashes.append(0)
+        self._key_hashes.append(key_hash)
+        self._rows += 1
+        return self._rows - 1
+
+    def _merge(self, culture: str, version: LocresVersion, namespaces: list):
+        if culture in self._translations:
+            raise ValueError(f"Culture [{culture}] is already loaded")
+
+        if not self._translations:
+            self.version = version
+            if version >= LocresVersion.Optimized:
+                self._hash_version = version
+        if version != self._hash_version:
+            # Hashes of this file do not match the stored ones
+            self._hash_version = None
+
+        translations = self._translations[culture] = [None] * self._rows
+        hashes = self._hashes[culture] = array("I", bytes(4 * self._rows))
+
+        for name_hash, name, keys in namespaces:
+            rows = self._namespaces.get(name)
+            if rows is None:
+                rows = self._namespaces[name] = {}
+                self._name_hashes[name] = name_hash or 0
+
+            for key_hash, key, source_hash, translation in keys:
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = self._add_row(key_hash or 0)
+                translations[row] = translation
+                hashes[row] = source_hash
+
+    def update_hashes(self):
+        """Compute the namespace and key hashes used by the current version."""
+        version = self.version
+        if version < LocresVersion.Optimized or self._hash_version == version:
+            return
+
+        if version == LocresVersion.CityHash:
+            hash_many = CityHash.hash_many
+        else:
+            hash_many = str_crc32_many
+
+        names = list(self._namespaces)
+        self._name_hashes = dict(zip(names, hash_many(names)))
+        for rows in self._namespaces.values():
+            for row, value in zip(rows.values(), hash_many(list(rows))):
+                self._key_hashes[row] = value
+        self._hash_version = version
+
+    def write(self, culture: str, file):
+        """Write the .locres file of one culture.
+
+        :param file: Path of the .locres file, or a seekable binary stream
+        """
+        translations = self._translations[culture]
+        hashes = self._hashes[culture]
+        key_hashes = self._key_hashes
+        self.update_hashes()
+
+        with LocresWriter(file, self.version) as writer:
+            for name, rows in self._namespaces.items():
+                if all(translations[row] is None for row in rows.values()):
+                    continue
+                writer.begin_namespace(name, self._name_hashes.get(name))
+                for key, row in rows.items():
+                    translation = translations[row]
+                    if translation is not None:
+                        writer.add(key, hashes[row], translation, key_hashes[row])
+
+    def write_all(self, directory: str | Path):
+        """Write every culture to ``<directory>/<culture>/<file name>``."""
+        for culture in self._translations:
+            path = Path(directory) / culture / self.file_name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.write(culture, path)
+
+    def to_locres(self, culture: str) -> LocresFile:
+        """Build a standalone LocresFile for one culture."""
+        locres = LocresFile()
+        locres.version = self.version
+        translations = self._translations[culture]
+        hashes = self._hashes[culture]
+
+        for name, rows in self._namespaces.items():
+            namespace = Namespace(name)
+            for key, row in rows.items():
+                if translations[row] is not None:
+                    namespace.add(Entry(key, translations[row], hashes[row]))
+            if len(namespace):
+                locres.add(namespace)
+        return locres
@@ -0,0 +1,208 @@
+import csv
+from pathlib import Path
+
+from .crc_hash import str_crc32_many
+from .locres import LocresFile, LocresVersion
+from .parser import iter_entries
+from .po import PoWriter, iter_po
+from .stats import LocresStats
+from .writer import LocresWriter
+
+# Buffer size of the streamed text files
+BUFFER_SIZE = 1024 * 1024
+
+
+def locres_to_csv(
+    path: str | Path, out: str | Path, stats: LocresStats | None = None
+):
+    """Export a .locres file to a .csv file.
+
+    Entries are streamed from the binary layout into a large write buffer,
+    the file is never loaded as a LocresFile.
+    """
+    if stats is not None:
+        start = stats.start()
+
+    with open(
+        out, "w", newline="", encoding="utf-8", buffering=BUFFER_SIZE
+    ) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["key", "hash", "source", "translation"])
+        # The source text is not stored in a .locres file
+        writer.writerows(
+            [f"{name},{key}", source_hash, "", translation]
+            for name, key, source_hash, translation in iter_entries(path)
+        )
+
+    if stats is not None:
+        stats.record("to_csv", start, Path(out).stat().st_size)
+
+
+def csv_to_locres(
+    path: str | Path,
+    out: str | Path,
+    version: LocresVersion = LocresVersion.CityHash,
+    stats: LocresStats | None = None,
+    grouped: bool = False,
+):
+    """Build a .locres file from a .csv file written by :func:`locres_to_csv`.
+
+    Rows are fed to a :class:`LocresWriter` instead of building a LocresFile.
+
+    :param grouped: The rows of each namespace are contiguous, so only one
+        namespace is held in memory at a time
+    """
+    if stats is not None:
+        start = stats.start()
+
+    # namespace -> key -> (key, source hash, translation), the last row wins
+    namespaces: dict[str, dict[str, tuple]] = {}
+    current = None
+
+    with open(
+        path, "r", newline="", encoding="utf-8", buffering=BUFFER_SIZE
+    ) as csvfile, LocresWriter(out, version) as writer:
+        reader = csv.DictReader(csvfile)
+
+        for row in reader:
+            name, key = row.get("key").split(",", 1)
+            source_hash = row.get("hash")
+            source = row.get("source") or ""
+            translation = row.get("translation") or source
+
+            if grouped and name != current:
+                if current is not None:
+                    writer.write_namespace(current, namespaces.pop(current).values())
+                current = name
+
+            entries = namespaces.get(name)
+            if entries is None:
+                entries = namespaces[name] = {}
+            entries[key] = (key, source_hash, translation)
+
+        for name, entries in namespaces.items():
+            writer.write_namespace(name, entries.values())
+
+    if stats is not None:
+        stats.record("from_csv", start, Path(path).stat().st_size)
+
+
+def locres_to_po(
+    path: str | Path, out: str | Path, stats: LocresStats | None = None
+):
+    """Convert a .locres file to a .po file (gettext format).
+
+    Entries are streamed from the binary layout through a :class:`PoWriter`.
+    """
+    if stats is not None:
+        start = stats.start()
+
+    with PoWriter(out) as writer:
+        for name, key, source_hash, translation in iter_entries(path):
+            writer.add(f"{name},{key}", translation)
+
+    if stats is not None:
+        stats.record("to_po", start, Path(out).stat().st_size)
+
+
+def po_to_locres(
+    path: str | Path,
+    out: str | Path,
+    version: LocresVersion = LocresVersion.CityHash,
+    stats: LocresStats | None = None,
+    grouped: bool = False,
+) -> list[str]:
+    """Build a .locres file from a .po file.
+
+    The .po file is parsed incrementally and fed to a :class:`LocresWriter`.
+    Source hashes are computed from the msgid in one batch per namespace.
+
+    :param grouped: The messages of each namespace are contiguous, as
+        :func:`locres_to_po` writes them, so only one namespace is held in
+        memory at a time
+    :return: The msgctxt of every entry that was skipped because it is not
+        in the ``namespace,key`` form
+    """
+    if stats is not None:
+        start = stats.start()
+
+    # namespace -> key -> (key, msgid, translation), the last message wins
+    namespaces: dict[str, dict[str, tuple]] = {}
+    current = None
+    skipped = []
+
+    with LocresWriter(out, version) as writer:
+        for msgctxt, msgid, msgstr in iter_po(path):
+            try:
+                name, key = msgctxt.split(",", 1)
+            except (AttributeError, ValueError):
+                skipped.append(msgctxt)
+                continue
+
+            if grouped and name != current:
+                if current is not None:
+                    _write_po_namespace(writer, current, namespaces.pop(current))
+                current = name
+
+            entries = namespaces.get(name)
+            if entries is None:
+                entries = namespaces[name] = {}
+            entries[key] = (key, msgid, msgstr or msgid)
+
+        for name, entries in namespaces.items():
+            _write_po_namespace(writer, name, entries)
+
+    if stats is not None:
+        stats.record("from_po", start, Path(path).stat().st_size)
+    return skipped
+
+
+def _write_po_namespace(writer: LocresWriter, name: str, entries: dict):
+    entries = entries.values()
+    source_hashes = str_crc32_many([msgid for _, msgid, _ in entries])
+    writer.write_namespace(
+        name,
+        [
+            (key, source_hash, translation)
+            for (key, _, translation), source_hash in zip(entries, source_hashes)
+        ],
+    )
+
+
+def fix_hashes(
+    path: str | Path,
+    source_file: str | Path,
+    out: str | Path,
+    stats: LocresStats | None = None,
+) -> tuple[int, int]:
+    """Replace source hashes in a .locres with those of the source language file.
+
+    :return: The number of fixed entries and the number of entries checked
+    """
+    source_locres = LocresFile()
+    source_locres.stats = stats
+    source_locres.read(source_file)
+
+    mod_locres = LocresFile()
+    mod_locres.stats = stats
+    mod_locres.read(path)
+
+    fixed = 0
+    total = 0
+
+    for mod_ns in mod_locres:
+        src_ns = source_locres[mod_ns.name] if mod_ns.name in source_locres else None
+        if not src_ns:
+            continue
+
+        src_entries_by_key = {e.key: e for e in src_ns}
+
+        for mod_entry in mod_ns:
+            total += 1
+            src_entry = src_entries_by_key.get(mod_entry.key)
+            if src_entry and mod_entry.hash != src_entry.hash:
+                mod_entry.hash = src_entry.hash
+                fixed += 1
+
+    mod_locres.write(out)
+    return fixed, total
@@ -1,3 +1,5 @@
+import zlib
+
 CRCTable = [
     0x00000000, 0x77073096, 0xee0e612c, 0x990951ba, 0x076dc419, 0x706af48f, 0xe963a535, 0x9e6495a3,
     0x0edb8832, 0x79dcb8a4, 0xe0d5e91e, 0x97d2d988, 0x09b64c2b, 0x7eb17cbd, 0xe7b82d07, 0x90bf1d91,
@@ -49,6 +51,20 @@ CRCTable = [
 ]
 
 def str_crc32(value, CRC=0):
+    # StrCrc32 feeds the four little-endian bytes of every character through
+    # the standard CRC-32 table, which is zlib's CRC-32 over UTF-32LE
+    return zlib.crc32(value.encode("utf-32-le", "surrogatepass"), CRC & 0xFFFFFFFF)
+
+
+def str_crc32_many(values, CRC=0):
+    """Compute :func:`str_crc32` for every string in one call."""
+    crc32 = zlib.crc32
+    CRC &= 0xFFFFFFFF
+    return [crc32(value.encode("utf-32-le", "surrogatepass"), CRC) for value in values]
+
+
+def str_crc32_reference(value, CRC=0):
+    """Table-driven StrCrc32, kept to verify :func:`str_crc32` against."""
     CRC = ~CRC & 0xFFFFFFFF
     for i in range(len(value)):
         ch = ord(value[i])
@@ -0,0 +1,242 @@
+import csv
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+from .locres import LocresFile
+from .parser import LocresParser, LocresVersion, _I32, _U32
+
+
+class DiffEntry(NamedTuple):
+    change: str  # "added", "removed", "changed" or "source"
+    namespace: str
+    key: str
+    old_hash: int | None
+    new_hash: int | None
+    old_translation: str | None
+    new_translation: str | None
+
+
+class _Side:
+    """Keys section of one file, indexed for the join.
+
+    ``records`` maps every entry's join key (the packed namespace/key hashes
+    when ``hashed``, ``(namespace, key)`` otherwise) to
+    ``translation id << 32 | source hash``. Translation ids come from a
+    registry of raw FStrings shared by both sides, so equal translations get
+    equal ids and entries can be matched with set operations.
+
+    :param base: Added to the ids of translations first seen on this side
+    """
+
+    def __init__(self, parser: LocresParser, hashed: bool, registry: dict, base: int):
+        self.parser = parser
+        self.hashed = hashed
+        self.base = base
+        self.offsets = None
+        self.namespaces = list(parser.iter_namespaces(values=False))
+
+        data = parser.data
+        if parser.version >= LocresVersion.Compact:
+            self.offsets = offsets = parser.string_offsets()
+            stride = 4 if parser.version >= LocresVersion.Optimized else 0
+            ends = [offset - stride for offset in offsets[1:]]
+            ends.append(parser.size - stride)
+            # Translation ids of the string table, the entries point into it
+            table = [
+                registry.setdefault(data[start:end], base + i)
+                for i, (start, end) in enumerate(zip(offsets, ends))
+            ]
+            unpack = _U32.unpack_from
+            translation_id = lambda position: table[unpack(data, position)[0]]
+        else:
+            translation_id = lambda position: registry.setdefault(
+                self.raw(position), base + position
+            )
+
+        joins = []
+        payloads = []
+        for name_hash, name, keys in self.namespaces:
+            if hashed:
+                high = name_hash << 32
+                joins.extend([high | key_hash for key_hash, _, _, _ in keys])
+            else:
+                joins.extend([(name, key) for _, key, _, _ in keys])
+            payloads.extend(
+                [
+                    translation_id(value) << 32 | source_hash
+                    for _, _, source_hash, value in keys
+                ]
+            )
+        self.records = dict(zip(joins, payloads))
+        # Entries sharing a join key, i.e. hash collisions or duplicated keys
+        self.collisions = len(joins) - len(self.records)
+
+    def raw(self, position: int) -> bytes:
+        """Return the FString at ``position`` as stored, length included."""
+        data = self.parser.data
+        length = _I32.unpack_from(data, position)[0]
+        size = length if length >= 0 else length * -2
+        return data[position : position + 4 + size]
+
+    def translation(self, translation_id: int) -> str:
+        position = translation_id - self.base
+        if self.offsets is not None:
+            position = self.offsets[position]
+        return self.parser.read_string(position)
+
+    def labels(self, joins: set) -> dict:
+        """Map the given join keys to ``(namespace, key)``, in file order."""
+        labels = {}
+        for name_hash, name, keys in self.namespaces:
+            if self.hashed:
+                high = name_hash << 32
+                for key_hash, key, _, _ in keys:
+                    if high | key_hash in joins:
+                        labels[high | key_hash] = (name, key)
+            else:
+                for _, key, _, _ in keys:
+                    if (name, key) in joins:
+                        labels[name, key] = (name, key)
+        return labels
+
+
+def diff_files(old: str | bytes | Path, new: str | bytes | Path) -> list[DiffEntry]:
+    """Diff two .locres files straight from their binary layout.
+
+    Entries are joined on their stored namespace/key hashes when both files
+    have the same hashed version, on the names otherwise. Translations are
+    matched as raw FStrings and only decoded when they differ.
+    """
+    with LocresParser.from_file(old, use_mmap=True) as old_parser:
+        with LocresParser.from_file(new, use_mmap=True) as new_parser:
+            hashed = (
+                old_parser.version == new_parser.version
+                and old_parser.version >= LocresVersion.Optimized
+            )
+            while True:
+                registry = {}
+                old_side = _Side(old_parser, hashed, registry, 0)
+                new_side = _Side(new_parser, hashed, registry, old_parser.size + 1)
+                if not hashed or not (old_side.collisions or new_side.collisions):
+                    break
+                # Two entries of a file share hashes, join on the names
+                hashed = False
+            return _join(old_side, new_side)
+
+
+def _translation(old: _Side, new: _Side, translation_id: int) -> str:
+    side = old if translation_id < new.base else new
+    return side.translation(translation_id)
+
+
+def _join(old: _Side, new: _Side) -> list[DiffEntry]:
+    old_records = old.records
+    new_records = new.records
+
+    # Entries with the same key, source hash and translation drop out here
+    get = old_records.get
+    differ = {join for join, payload in new_records.items() if get(join) != payload}
+    added = sum(join not in old_records for join in differ)
+    removed = set()
+    if len(old_records) > len(new_records) - added:
+        removed = {join for join in old_records if join not in new_records}
+
+    changes = []
+    append = changes.append
+    for join, (name, key) in new.labels(differ).items():
+        new_id, new_hash = divmod(new_records[join], 1 << 32)
+        new_text = _translation(old, new, new_id)
+        if join not in old_records:
+            append(DiffEntry("added", name, key, None, new_hash, None, new_text))
+            continue
+
+        old_id, old_hash = divmod(old_records[join], 1 << 32)
+        # The same text may be ASCII in one file and UTF-16 in the other
+        old_text = new_text if old_id == new_id else old.translation(old_id)
+        if old_text != new_text:
+            append(
+                DiffEntry("changed", name, key, old_hash, new_hash, old_text, new_text)
+            )
+        elif old_hash != new_hash:
+            append(DiffEntry("source", name, key, old_hash, new_hash, None, None))
+
+    for join, (name, key) in old.labels(removed).items():
+        old_id, old_hash = divmod(old_records[join], 1 << 32)
+        old_text = old.translation(old_id)
+        append(DiffEntry("removed", name, key, old_hash, None, old_text, None))
+    return changes
+
+
+def diff(
+    old: LocresFile | str | bytes | Path, new: LocresFile | str | bytes | Path
+) -> list[DiffEntry]:
+    """Report added, removed and changed keys and source hash changes.
+
+    ``changed`` entries have a different translation (and possibly source
+    hash), ``source`` entries only a different source hash.
+
+    :param old: The file to compare against, a LocresFile or a .locres file
+    :param new: The newer file, a LocresFile or a .locres file
+    """
+    if not isinstance(old, LocresFile) and not isinstance(new, LocresFile):
+        return diff_files(old, new)
+
+    if not isinstance(old, LocresFile):
+        old = _read(old)
+    if not isinstance(new, LocresFile):
+        new = _read(new)
+
+    changes = []
+    append = changes.append
+
+    for namespace in new:
+        name = namespace.name
+        old_namespace = old[name]
+        old_entries = old_namespace.entrys if old_namespace is not None else {}
+        for entry in namespace:
+            key, new_hash, new_text = entry.key, int(entry.hash), entry.translation
+            old_entry = old_entries.get(key)
+            if old_entry is None:
+                append(DiffEntry("added", name, key, None, new_hash, None, new_text))
+                continue
+
+            old_hash, old_text = int(old_entry.hash), old_entry.translation
+            if old_text != new_text:
+                append(
+                    DiffEntry(
+                        "changed", name, key, old_hash, new_hash, old_text, new_text
+                    )
+                )
+            elif old_hash != new_hash:
+                append(DiffEntry("source", name, key, old_hash, new_hash, None, None))
+
+    for namespace in old:
+        name = namespace.name
+        new_namespace = new[name]
+        new_entries = new_namespace.entrys if new_namespace is not None else {}
+        for entry in namespace:
+            key = entry.key
+            if key not in new_entries:
+                old_hash, old_text = int(entry.hash), entry.translation
+                append(DiffEntry("removed", name, key, old_hash, None, old_text, None))
+    return changes
+
+
+def _read(file) -> LocresFile:
+    locres = LocresFile()
+    locres.read(file)
+    return locres
+
+
+def write_json(changes: list[DiffEntry], out: str | Path):
+    with open(out, "w", encoding="utf-8") as f:
+        rows = [change._asdict() for change in changes]
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+def write_csv(changes: list[DiffEntry], out: str | Path):
+    with open(out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DiffEntry._fields)
+        writer.writerows(changes)
@@ -1,27 +1,32 @@
+import struct
+
 from binsl import BinReader, BinWriter
 
+_I32 = struct.Struct("<i")
+
 class FString():
     @staticmethod
     def read(BR: BinReader, length = None):
         if length is None:
             length = BR.int32()
-        if length > 0:
-            data = BR.read(length)
-            return data.decode("ascii", errors="replace").rstrip("\0")
-        elif length < 0:
-            size = length * -2
-            data = BR.read(size)
-            return data.decode("utf-16le", errors="replace").rstrip("\0")
-        else:
+        if length == 0:
             return ""
+        # BR.read returns a copy of the bytes, the memoryview only drops the
+        # terminator without slicing that copy into another one
+        if length > 0:
+            data = memoryview(BR.read(length))
+            return str(data[:-1], "ascii", "replace")
+        data = memoryview(BR.read(length * -2))
+        return str(data[:-2], "utf-16le", "replace")
     
     @staticmethod
-    def write(BW: BinWriter, value: str, use_unicode: bool = False):
-        value += "\x00"
+    def encode(value: str, use_unicode: bool = False) -> bytes:
+        """Return the serialized FString, length prefix included."""
         if (not use_unicode) and value.isascii():
-            BW.uint32(len(value))
-            BW.write(value.encode("ascii"))
-        else:
-            encoded = value.encode("utf-16le")
-            BW.int32(-(len(encoded) // 2))
-            BW.write(encoded)
\ No newline at end of file
+            return _I32.pack(len(value) + 1) + value.encode("ascii") + b"\x00"
+        encoded = value.encode("utf-16le")
+        return _I32.pack(-(len(encoded) // 2 + 1)) + encoded + b"\x00\x00"
+
+    @staticmethod
+    def write(BW: BinWriter, value: str, use_unicode: bool = False):
+        BW.write(FString.encode(value, use_unicode))
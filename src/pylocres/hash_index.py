@@ -0,0 +1,137 @@
+from pathlib import Path
+
+from .city_hash import CityHash
+from .crc_hash import str_crc32_many
+from .parser import LocresParser, LocresVersion
+
+
+class LocresHashIndex:
+    """
+    Read-only lookup of entries by namespace and key hash, like the UE runtime.
+
+    Built straight from the keys section: no Namespace or Entry objects and
+    no string-keyed dicts are created. Optimized and later files provide the
+    hashes themselves; for older files they are computed in bulk with
+    ``hash_version``'s algorithm.
+
+    ```python
+    index = LocresHashIndex.read("Game.locres")
+    source_hash, translation = index.lookup_by_hash(ns_hash, key_hash)
+    ```
+    """
+
+    def __init__(self):
+        self.version = LocresVersion.CityHash
+        self.hash_version = LocresVersion.CityHash
+        self.collisions = 0
+        # (namespace_hash << 32 | key_hash) -> (source_hash << 32 | string index)
+        self._records: dict[int, int] = {}
+        self._strings = []
+        # String table positions of a lazy index, scanned on first lookup
+        self._offsets = None
+        self._lazy = False
+        self._parser = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, hashes: tuple[int, int]) -> bool:
+        return (hashes[0] << 32 | hashes[1]) in self._records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def read(
+        cls,
+        file: str | bytes | Path,
+        lazy: bool = False,
+        hash_version: LocresVersion = LocresVersion.CityHash,
+    ):
+        """Build the index for a .locres file.
+
+        :param file: Path to a .locres file, or its contents
+        :param lazy: Keep the file mapped and decode translations on lookup
+        :param hash_version: Algorithm for files that store no hashes
+        """
+        index = cls()
+        parser = LocresParser.from_file(file, use_mmap=lazy)
+        index.version = parser.version
+        hashed = parser.version >= LocresVersion.Optimized
+        index.hash_version = parser.version if hashed else hash_version
+        legacy = parser.version == LocresVersion.Legacy
+
+        if lazy:
+            index._parser = parser
+            index._lazy = True
+        elif not legacy:
+            index._strings = parser.read_strings()
+
+        records = index._records
+        total = 0
+        namespaces = parser.iter_namespaces(values=not (lazy and legacy))
+
+        if hashed:
+            for namespace_hash, name, keys in namespaces:
+                high = namespace_hash << 32
+                total += len(keys)
+                for key_hash, key, source_hash, value in keys:
+                    records[high | key_hash] = source_hash << 32 | value
+        else:
+            if index.hash_version == LocresVersion.CityHash:
+                hash_many = CityHash.hash_many
+            else:
+                hash_many = str_crc32_many
+
+            for namespace_hash, name, keys in namespaces:
+                high = hash_many([name])[0] << 32
+                key_hashes = hash_many([key for _, key, _, _ in keys])
+                total += len(keys)
+                for key_hash, (_, key, source_hash, value) in zip(key_hashes, keys):
+                    if legacy and not lazy:
+                        # Legacy translations are inline, collect them as a table
+                        index._strings.append(value)
+                        value = len(index._strings) - 1
+                    records[high | key_hash] = source_hash << 32 | value
+
+        # Entries whose hashes were already taken; the last one wins
+        index.collisions = total - len(records)
+        return index
+
+    def lookup_by_hash(
+        self, namespace_hash: int, key_hash: int
+    ) -> tuple[int, str] | None:
+        """Return ``(source_hash, translation)`` for the hashes, or ``None``."""
+        record = self._records.get(namespace_hash << 32 | key_hash)
+        if record is None:
+            return None
+        return record >> 32, self._translation(record & 0xFFFFFFFF)
+
+    def lookup(self, namespace: str, key: str) -> tuple[int, str] | None:
+        """Hash a namespace and key the way this file does and look them up."""
+        if self.hash_version == LocresVersion.CityHash:
+            namespace_hash, key_hash = CityHash.hash_many([namespace, key])
+        else:
+            namespace_hash, key_hash = str_crc32_many([namespace, key])
+        return self.lookup_by_hash(namespace_hash, key_hash)
+
+    def _translation(self, value: int) -> str:
+        if not self._lazy:
+            return self._strings[value]
+        if self._parser is None:
+            raise ValueError("Hash index is closed")
+        if self.version == LocresVersion.Legacy:
+            # Lazy Legacy records point straight at the translation FString
+            return self._parser.read_string(value)
+        if self._offsets is None:
+            self._offsets = self._parser.string_offsets()
+        return self._parser.read_string(self._offsets[value])
+
+    def close(self):
+        """Release the file mapped by a lazy read, lookups raise afterwards."""
+        if self._parser is not None:
+            self._parser.close()
+            self._parser = None
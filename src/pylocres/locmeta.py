@@ -1,6 +1,7 @@
 import os
 from enum import IntEnum
 
+from . import aio
 from .city_hash import CityHash
 from .crc_hash import str_crc32
 from .file_io import FString
@@ -78,3 +79,26 @@ class LocmetaFile:
 
             if self.version == LocmetaVersion.V2:
                 BW.bool(self.bIsUGC)
+
+    @classmethod
+    async def aread(cls, path: str) -> "LocmetaFile":
+        """
+        Read a .locmeta file on the :mod:`pylocres.aio` executor.
+
+        :param path: The path to the .locmeta file to read
+        """
+        return await aio.run(_read_file, cls, path)
+
+    async def awrite(self, path: str):
+        """
+        Write a .locmeta file on the :mod:`pylocres.aio` executor.
+
+        :param path: The path to the .locmeta file to write to
+        """
+        await aio.run(self.write, path)
+
+
+def _read_file(cls, path):
+    locmeta = cls()
+    locmeta.read(path)
+    return locmeta
@@ -1,29 +1,100 @@
-from enum import IntEnum
+import asyncio
+import os
+import struct
+from array import array
+from collections.abc import MutableMapping
 from pathlib import Path
-from typing import Iterator
+from typing import BinaryIO, Callable, Iterable, Iterator
 
 from binsl import BinReader, BinWriter, Position
 
+from . import aio
 from .city_hash import CityHash
-from .crc_hash import str_crc32
+from .crc_hash import str_crc32, str_crc32_many
 from .file_io import FString
+from .parser import LOCRES_MAGIC, LocresParser, LocresVersion
+from .stats import LocresStats
 
-LOCRES_MAGIC = b"\x0e\x14\x74\x75\x67\x4a\x03\xfc\x4a\x15\x90\x9d\xc3\x37\x7f\x1b"
+_I32 = struct.Struct("<i")
+_U32 = struct.Struct("<I")
+_U32_U32 = struct.Struct("<II")
+_VERSION_OFFSET = struct.Struct("<BQ")
+_HEADER_SIZE = len(LOCRES_MAGIC) + _VERSION_OFFSET.size
+# Strings (and reference counts) encoded per piece of the string table
+_TEXT_BATCH = 8192
 
 
-class LocresVersion(IntEnum):
-    Legacy = 0
-    Compact = 1
-    Optimized = 2
-    CityHash = 3
+class LazyStringTable:
+    """String table that decodes entries from an open parser on first access.
+
+    :param parser: The parser the table was scanned from, kept open until closed
+    :param offsets: Position of every FString in the table
+    """
+
+    def __init__(self, parser: LocresParser, offsets: list[int]):
+        self._parser = parser
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index) -> str:
+        if self._parser is None:
+            raise ValueError("Lazy string table is closed")
+        return self._parser.read_string(self._offsets[index])
+
+    def close(self):
+        if self._parser is not None:
+            self._parser.close()
+            self._parser = None
+
 
 class Entry:
+    __slots__ = (
+        "_key",
+        "_key_hash",
+        "_hash_version",
+        "_translation",
+        "hash",
+        "_string_index",
+        "_strings",
+    )
+
     def __init__(self, key, translation, value, is_hash=True):
         self.key = key
-        self.translation = translation
+        self._translation = translation
         self.hash = value if is_hash else str_crc32(value)
 
         self._string_index = None
+        self._strings = None
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @key.setter
+    def key(self, value: str):
+        # The stored key hash is only valid for the key it was computed from
+        self._key = value
+        self._key_hash = None
+        self._hash_version = None
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the key hash has to be recomputed on the next write."""
+        return self._hash_version is None
+
+    @property
+    def translation(self) -> str:
+        if self._strings is not None:
+            self._translation = self._strings[self._string_index]
+            self._strings = None
+        return self._translation
+
+    @translation.setter
+    def translation(self, value: str):
+        self._translation = value
+        self._strings = None
 
 
 class Namespace:
@@ -31,6 +102,21 @@ class Namespace:
         self.name = name
         self.entrys: dict[str, Entry] = {}
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+        self._name_hash = None
+        self._hash_version = None
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the name hash has to be recomputed on the next write."""
+        return self._hash_version is None
+
     def __iter__(self) -> Iterator[Entry]:
         return iter(self.entrys.values())
 
@@ -58,6 +144,237 @@ class Namespace:
         del self.entrys[key]
 
 
+class ColumnarEntry:
+    """Entry view over one row of a :class:`ColumnarNamespace`.
+
+    Views are created on access and write straight through to the columns.
+    The row is looked up by key on every access, so a view stays on its
+    entry when other rows are removed, and raises ``KeyError`` once its own
+    entry is removed.
+    """
+
+    __slots__ = ("_namespace", "_key")
+
+    def __init__(self, namespace: "ColumnarNamespace", key: str):
+        self._namespace = namespace
+        self._key = key
+
+    @property
+    def _row(self) -> int:
+        try:
+            return self._namespace._index[self._key]
+        except KeyError:
+            raise KeyError(
+                f"Key [{self._key}] was removed from [{self._namespace.name}]"
+            ) from None
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @key.setter
+    def key(self, value: str):
+        namespace = self._namespace
+        row = self._row
+        if value == self._key:
+            return
+        if value in namespace._index:
+            raise ValueError(f"Key [{value}] already exists in [{namespace.name}]")
+        del namespace._index[self._key]
+        namespace._index[value] = row
+        namespace._keys[row] = value
+        namespace._hash_versions[row] = 0
+        self._key = value
+
+    @property
+    def translation(self) -> str:
+        return self._namespace._translation(self._row)
+
+    @translation.setter
+    def translation(self, value: str):
+        self._namespace._translations[self._row] = value
+
+    @property
+    def hash(self) -> int:
+        return self._namespace._hashes[self._row]
+
+    @hash.setter
+    def hash(self, value: int):
+        self._namespace._hashes[self._row] = int(value)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the key hash has to be recomputed on the next write."""
+        return not self._namespace._hash_versions[self._row]
+
+    @property
+    def _key_hash(self) -> int:
+        return self._namespace._key_hashes[self._row]
+
+    @_key_hash.setter
+    def _key_hash(self, value: int):
+        self._namespace._key_hashes[self._row] = value
+
+    @property
+    def _hash_version(self) -> LocresVersion | None:
+        version = self._namespace._hash_versions[self._row]
+        return LocresVersion(version) if version else None
+
+    @_hash_version.setter
+    def _hash_version(self, value: LocresVersion | None):
+        self._namespace._hash_versions[self._row] = value or 0
+
+    @property
+    def _string_index(self) -> int:
+        return self._namespace._string_indices[self._row]
+
+    @_string_index.setter
+    def _string_index(self, value: int):
+        self._namespace._string_indices[self._row] = value
+
+
+class ColumnarEntries(MutableMapping):
+    """Dict-like ``entrys`` view of a :class:`ColumnarNamespace`."""
+
+    __slots__ = ("_namespace",)
+
+    def __init__(self, namespace: "ColumnarNamespace"):
+        self._namespace = namespace
+
+    def __getitem__(self, key) -> ColumnarEntry:
+        if key not in self._namespace._index:
+            raise KeyError(key)
+        return ColumnarEntry(self._namespace, key)
+
+    def __setitem__(self, key, entry):
+        self._namespace._set(key, entry)
+
+    def __delitem__(self, key):
+        self._namespace.remove(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._namespace._keys)
+
+    def __len__(self) -> int:
+        return len(self._namespace._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._namespace._index
+
+
+class ColumnarNamespace(Namespace):
+    """
+    Namespace that keeps its entries in parallel columns instead of objects.
+
+    Keys and translations are held in lists, and the source hashes, key
+    hashes and string indices in ``array('I')`` columns, with a dict from key
+    to row. Entries are handed out as :class:`ColumnarEntry` views, so the
+    usual Namespace/Entry API keeps working.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._keys: list[str] = []
+        self._translations: list[str | None] = []
+        self._hashes = array("I")
+        self._key_hashes = array("I")
+        self._hash_versions = bytearray()
+        self._string_indices = array("I")
+        self._index: dict[str, int] = {}
+        self._strings = None
+
+    @property
+    def entrys(self) -> ColumnarEntries:
+        return ColumnarEntries(self)
+
+    def __iter__(self) -> Iterator[ColumnarEntry]:
+        for key in self._keys:
+            yield ColumnarEntry(self, key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, index) -> ColumnarEntry:
+        return ColumnarEntry(self, index) if index in self._index else None
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def _translation(self, row: int) -> str:
+        translation = self._translations[row]
+        if translation is None and self._strings is not None:
+            translation = self._strings[self._string_indices[row]]
+            self._translations[row] = translation
+        return translation
+
+    def _set(self, key: str, entry) -> None:
+        row = self._index.get(key)
+        key_hash = entry._key_hash if entry._hash_version is not None else 0
+        if row is None:
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+            self._translations.append(entry.translation)
+            self._hashes.append(int(entry.hash))
+            self._key_hashes.append(key_hash)
+            self._hash_versions.append(entry._hash_version or 0)
+            self._string_indices.append(0)
+        else:
+            self._translations[row] = entry.translation
+            self._hashes[row] = int(entry.hash)
+            self._key_hashes[row] = key_hash
+            self._hash_versions[row] = entry._hash_version or 0
+
+    def add(self, entry: Entry) -> None:
+        self._set(entry.key, entry)
+
+    def remove(self, key: str) -> None:
+        """Remove an entry, shifting the following rows up.
+
+        This is linear in the size of the namespace, so removing many keys
+        is cheaper by building a new namespace from the rows to keep.
+        """
+        row = self._index.pop(key)
+        for column in (
+            self._keys,
+            self._translations,
+            self._hashes,
+            self._key_hashes,
+            self._hash_versions,
+            self._string_indices,
+        ):
+            del column[row]
+        for key in self._keys[row:]:
+            self._index[key] -= 1
+
+    def extend(self, keys, strings=None, hash_version=None, lazy=False):
+        """Append rows straight from :meth:`LocresParser.iter_namespaces` tuples.
+
+        :param keys: ``(key_hash, key, source_hash, value)`` tuples
+        :param strings: String table that ``value`` indexes into, or ``None``
+            when ``value`` is the translation itself
+        :param hash_version: Version the key hashes were computed with
+        :param lazy: Leave translations in ``strings`` until first access
+        """
+        if lazy:
+            self._strings = strings
+        version = hash_version or 0
+
+        for key_hash, key, source_hash, value in keys:
+            if key in self._index:
+                self.remove(key)
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+            self._hashes.append(source_hash)
+            self._key_hashes.append(key_hash if version else 0)
+            self._hash_versions.append(version)
+            if strings is None:
+                self._translations.append(value)
+                self._string_indices.append(0)
+            else:
+                self._translations.append(None if lazy else strings[value])
+                self._string_indices.append(value)
+
+
 class LocresFile:
     def __init__(self):
         self.version = LocresVersion.CityHash
@@ -65,6 +382,11 @@ class LocresFile:
 
         self._offset = None
         self._strings = []
+        self._encoded: dict[str, bytes] = {}
+        self._lazy = None
+
+        # Optional LocresStats that records phase timings and counters
+        self.stats: LocresStats | None = None
 
     def __iter__(self) -> Iterator[Namespace]:
         return iter(self.namespaces.values())
@@ -83,6 +405,12 @@ class LocresFile:
     def __contains__(self, key) -> bool:
         return key in self.namespaces
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def add(self, entry: Namespace):
         """Add a namespace to the file"""
         self.namespaces[entry.name] = entry
@@ -91,23 +419,275 @@ class LocresFile:
         """Remove a namespace from the file"""
         del self.namespaces[name]
 
-    def read(self, file: str | bytes | Path):
+    def read(
+        self,
+        file: str | bytes | Path,
+        lazy: bool = False,
+        columnar: bool = False,
+        namespaces: Iterable[str] | None = None,
+        key_filter: Callable[[str, str], bool] | None = None,
+    ):
         """Read a .locres file and fill the file object with the namespaces and entries
 
         :param path: The path to the .locres file
+        :param lazy: Keep the file memory-mapped and decode translations
+            the first time they are accessed. Call :meth:`close` (or use the
+            file object as a context manager) to release the mapping.
+        :param columnar: Store entries in :class:`ColumnarNamespace` columns
+            instead of one :class:`Entry` object per key
+        :param namespaces: Only read the namespaces with these names, the
+            others are skipped without being decoded
+        :param key_filter: Only read the entries for which
+            ``key_filter(namespace, key)`` is true
         """
 
+        self.close()
         self.namespaces = {}
         self._offset = None
         self._strings = []
-        
-        with BinReader(file) as BR:
-            self.read_header(BR)
 
+        stats = self.stats
+        if stats is not None:
+            start = stats.start()
+
+        parser = LocresParser.from_file(file, use_mmap=lazy)
+        self.version = parser.version
+        self._offset = parser.offset
+
+        if stats is not None:
+            stats.record("read_header", start, parser.keys_pos)
+            start = stats.start()
+
+        if isinstance(namespaces, str):
+            namespaces = [namespaces]
+        if namespaces is not None:
+            namespaces = set(namespaces)
+        selected = namespaces is not None or key_filter is not None
+
+        if lazy:
+            self._lazy = LazyStringTable(parser, [])
+
+        try:
             if self.version >= LocresVersion.Compact:
-                self.read_strings(BR)
+                if lazy:
+                    self._lazy._offsets.extend(parser.string_offsets())
+                elif selected:
+                    # Only the strings the selected keys point to get decoded
+                    self._strings = LazyStringTable(parser, parser.string_offsets())
+                else:
+                    self._strings = parser.read_strings()
+                if stats is not None:
+                    stats.record("read_strings", start, parser.size - parser.offset)
+                    stats.count("strings", len(self._lazy if lazy else self._strings))
+                    start = stats.start()
+
+            self.read_namespaces(parser, self._lazy, columnar, namespaces, key_filter)
+        except Exception:
+            self.close()
+            raise
+        finally:
+            if selected and not lazy:
+                self._strings = []
+
+        if stats is not None:
+            end = parser.offset if parser.offset is not None else parser.size
+            stats.record("read_keys", start, end - parser.keys_pos)
+            stats.count("namespaces", len(self))
+            stats.count("entries", sum(len(namespace) for namespace in self))
+
+    def read_namespaces(
+        self,
+        parser: LocresParser,
+        lazy: LazyStringTable | None = None,
+        columnar: bool = False,
+        namespaces: Iterable[str] | None = None,
+        key_filter: Callable[[str, str], bool] | None = None,
+    ):
+        """Build the namespaces and entries from a parser's keys section.
+
+        See :meth:`LocresParser.iter_namespaces` for ``namespaces`` and
+        ``key_filter``.
+        """
+        strings = self._strings
+        version = self.version
+        legacy = version == LocresVersion.Legacy
+        hashed = version >= LocresVersion.Optimized
+        offsets = lazy._offsets if lazy is not None else None
+
+        values = lazy is None or not legacy
+
+        if namespaces is None and key_filter is None:
+            walk = parser.iter_namespaces(values)
+        else:
+            walk = parser.iter_namespaces(values, namespaces, key_filter)
+
+        for namespace_hash, name, keys in walk:
+            namespace = ColumnarNamespace(name) if columnar else Namespace(name)
+            if hashed:
+                namespace._name_hash = namespace_hash
+                namespace._hash_version = version
+            self.add(namespace)
+
+            if columnar:
+                hash_version = version if hashed else None
+                if lazy is None:
+                    namespace.extend(keys, None if legacy else strings, hash_version)
+                    continue
+                if legacy:
+                    start = len(offsets)
+                    offsets.extend(value for _, _, _, value in keys)
+                    keys = [
+                        (key_hash, key, source_hash, start + i)
+                        for i, (key_hash, key, source_hash, _) in enumerate(keys)
+                    ]
+                namespace.extend(keys, lazy, hash_version, lazy=True)
+                continue
+
+            entrys = namespace.entrys
 
-            self.read_keys(BR)
+            for key_hash, key, source_hash, value in keys:
+                if lazy is not None:
+                    entry = Entry(key, None, source_hash)
+                    if legacy:
+                        entry._string_index = len(offsets)
+                        offsets.append(value)
+                    else:
+                        entry._string_index = value
+                    entry._strings = lazy
+                elif legacy:
+                    entry = Entry(key, value, source_hash)
+                else:
+                    entry = Entry(key, strings[value], source_hash)
+                if hashed:
+                    entry._key_hash = key_hash
+                    entry._hash_version = version
+                entrys[key] = entry
+
+    @staticmethod
+    def patch(
+        file: str | Path,
+        changes: dict[tuple[str, str], str],
+        out: str | Path | None = None,
+    ) -> int:
+        """Change translations without rewriting the keys section.
+
+        The header and key records are copied as they are, except for the
+        string index of changed entries, and only the string table is
+        regenerated. Needs a Compact or later file.
+
+        :param file: The .locres file to patch
+        :param changes: New translations by ``(namespace, key)``
+        :param out: Where to write the result, the input file by default
+        :return: The number of entries that were changed
+        """
+        parser = LocresParser.from_file(file)
+        version = parser.version
+        if version < LocresVersion.Compact:
+            raise ValueError("Only Compact and later .locres files can be patched")
+
+        data = parser.data
+        offsets = parser.string_offsets()
+        counts = [0] * len(offsets)
+        index_positions = []
+        patched = []
+        pending = dict(changes)
+
+        for namespace_hash, name, keys in parser.iter_namespaces(False):
+            for key_hash, key, source_hash, pos in keys:
+                index_positions.append(pos)
+                translation = pending.pop((name, key), None)
+                if translation is None:
+                    counts[_U32.unpack_from(data, pos)[0]] += 1
+                else:
+                    patched.append((pos, translation))
+
+        if pending:
+            raise KeyError(next(iter(pending)))
+
+        keys_section = bytearray(data[: parser.offset])
+
+        # Raw FString -> index of the strings already in the table
+        existing = {}
+        if patched:
+            for index, start in enumerate(offsets):
+                length = _I32.unpack_from(data, start)[0]
+                end = start + 4 + (length if length >= 0 else length * -2)
+                existing.setdefault(data[start:end], index)
+
+        # New translations that are not in the table yet, with their users
+        new_strings: dict[bytes, list[int]] = {}
+        for pos, translation in patched:
+            encoded = FString.encode(translation)
+            index = existing.get(encoded)
+            if index is None:
+                new_strings.setdefault(encoded, []).append(pos)
+            else:
+                counts[index] += 1
+                _U32.pack_into(keys_section, pos, index)
+
+        # Drop strings no key refers to any more
+        kept = len(offsets)
+        if 0 in counts:
+            remap = []
+            kept = 0
+            for count in counts:
+                remap.append(kept)
+                kept += count > 0
+            for pos in index_positions:
+                index = _U32.unpack_from(keys_section, pos)[0]
+                _U32.pack_into(keys_section, pos, remap[index])
+
+        # New translations are appended after the strings still in use
+        for index, positions in enumerate(new_strings.values(), kept):
+            for pos in positions:
+                _U32.pack_into(keys_section, pos, index)
+
+        optimized = version >= LocresVersion.Optimized
+        chunks = [keys_section]
+        string_count = kept + len(new_strings)
+        chunks.append(_U32.pack(string_count))
+
+        for start, count in zip(offsets, counts):
+            if not count:
+                continue
+            length = _I32.unpack_from(data, start)[0]
+            end = start + 4 + (length if length >= 0 else length * -2)
+            chunks.append(data[start:end])
+            if optimized:
+                chunks.append(_U32.pack(count))
+
+        for encoded, positions in new_strings.items():
+            chunks.append(encoded)
+            if optimized:
+                chunks.append(_U32.pack(len(positions)))
+
+        # Replace the target in one step, a failed write leaves it untouched
+        target = Path(out or file)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.writelines(chunks)
+            os.replace(tmp, target)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        return len(patched)
+
+    def load(self):
+        """Decode every pending lazy translation and release the mapped file."""
+        if self._lazy is None:
+            return
+        for namespace in self:
+            for entry in namespace:
+                entry.translation
+        self.close()
+
+    def close(self):
+        """Release the file mapped by a lazy read."""
+        if self._lazy is not None:
+            self._lazy.close()
+            self._lazy = None
 
     def read_header(self, BR: BinReader):
         if BR.read(16) == LOCRES_MAGIC:
@@ -164,109 +744,370 @@ class LocresFile:
                     entry = Entry(string_key, translation, source_string_hash)
                     namespace.add(entry)
 
-    def to_binary(self):
-        with BinWriter() as BW:
-            self.write_header(BW)
-            self.make_string_dict()
-            if self.version == LocresVersion.Legacy:
-                self.save_legacy(BW)
-                return BW.get_bytes()
-            self.write_keys(BW)
-            self.write_text(BW)
-            return BW.get_bytes()
-
-    def write(self, file: str | Path):
+    def to_binary(self, view: bool = False) -> bytes | memoryview:
+        """Build the .locres file in memory.
+
+        :param view: Copy the pieces into one bytearray allocated at the exact
+            output size and return a memoryview of it, instead of bytes
+        """
+        size, pieces = self.render()
+        if not view:
+            return b"".join(pieces)
+
+        buffer = memoryview(bytearray(size))
+        pos = 0
+        for piece in pieces:
+            end = pos + len(piece)
+            buffer[pos:end] = piece
+            pos = end
+        return buffer
+
+    def write(self, file: str | Path | BinaryIO):
         """Write the contents of the LocresFile to a .locres file.
 
-        :param path: The path to the .locres file to write to
+        The file is streamed out a namespace at a time.
+
+        :param file: The path to the .locres file to write to, or a writable
+            binary stream (an open file, BytesIO, archive member, socket...)
+        """
+        # The target may be the file a lazy read still has mapped
+        self.load()
+
+        _, pieces = self.render()
+        if isinstance(file, (str, Path)):
+            with open(file, "wb") as f:
+                for piece in pieces:
+                    f.write(piece)
+        else:
+            for piece in pieces:
+                _write_all(file, piece)
+
+    @classmethod
+    async def aread(
+        cls,
+        file: str | bytes | Path,
+        lazy: bool = False,
+        columnar: bool = False,
+        namespaces: Iterable[str] | None = None,
+        key_filter: Callable[[str, str], bool] | None = None,
+    ) -> "LocresFile":
+        """Read a .locres file on the :mod:`pylocres.aio` executor.
+
+        Same parameters as :meth:`read`.
+        """
+        return await aio.run(
+            _read_file, cls, file, lazy, columnar, namespaces, key_filter
+        )
+
+    @classmethod
+    async def aread_many(cls, files, **kwargs) -> list["LocresFile"]:
+        """Read several .locres files concurrently, e.g. one per culture."""
+        return await asyncio.gather(*(cls.aread(file, **kwargs) for file in files))
+
+    async def awrite(self, file: str | Path | BinaryIO):
+        """Write the file without blocking the event loop.
+
+        The file is built in memory first, so cancelling the task before
+        that is done leaves the target untouched. Do not modify the object
+        while the write is pending.
+
+        :param file: The path to the .locres file, or a writable binary
+            stream as for :meth:`write`. The stream is written to from the
+            executor thread.
+        """
+        if self._lazy is not None:
+            # The target may be the file a lazy read still has mapped
+            await aio.run(self.load)
+        data = await aio.run(self.to_binary)
+        if isinstance(file, (str, Path)):
+            await aio.run(aio.write_bytes, file, data)
+        else:
+            await aio.run(_write_all, file, data)
+
+    def render(self) -> tuple[int, Iterator[bytes]]:
+        """Prepare the file for output.
+
+        Deduplicates and encodes the strings and updates the hashes, then
+        returns the exact size of the file and an iterator over its encoded
+        pieces, a namespace or a batch of strings at a time. Phases are
+        recorded when stats are enabled.
         """
-        with BinWriter(file) as BW:
-            self.write_header(BW)
-            self.make_string_dict()
-            if self.version == LocresVersion.Legacy:
-                self.save_legacy(BW)
-                return
-            self.write_keys(BW)
-            self.write_text(BW)
+        stats = self.stats
+
+        if stats is not None:
+            start = stats.start()
+        self.make_string_dict()
+        if stats is not None:
+            stats.record("make_string_dict", start)
+            entries = sum(len(namespace) for namespace in self)
+            stats.count("namespaces", len(self))
+            stats.count("entries", entries)
+            stats.count("strings", len(self._strings))
+            stats.count("duplicates", entries - len(self._strings))
+
+        if self.version == LocresVersion.Legacy:
+            keys_size = self._keys_size()
+            return keys_size, self._pieces(keys_size)
+
+        if stats is not None:
+            start = stats.start()
+        self.update_hashes()
+        if stats is not None:
+            stats.record("update_hashes", start)
+
+        keys_size = self._keys_size()
+        size = _HEADER_SIZE + keys_size + self._text_size()
+        return size, self._pieces(keys_size)
+
+    def _pieces(self, keys_size: int) -> Iterator[bytes]:
+        stats = self.stats
+        if stats is not None:
+            start = stats.start()
+
+        if self.version == LocresVersion.Legacy:
+            yield from self._legacy_section()
+            if stats is not None:
+                stats.record("save_legacy", start, keys_size)
+            return
+
+        # The string table follows the keys, its offset is known up front
+        yield self.header(_HEADER_SIZE + keys_size)
+        if stats is not None:
+            stats.record("write_header", start, _HEADER_SIZE)
+            start = stats.start()
+
+        yield from self._key_section()
+        if stats is not None:
+            stats.record("write_keys", start, keys_size)
+            start = stats.start()
+
+        yield from self._text_section()
+        if stats is not None:
+            stats.record("write_text", start, self._text_size())
+        self._encoded = {}
+
+    def _keys_size(self) -> int:
+        """Return the size of the keys section, encoding names and keys."""
+        encoded = self._encoded
+        encode = FString.encode
+        legacy = self.version == LocresVersion.Legacy
+        # Key hash, or namespace hash, of Optimized and later
+        extra = 4 if self.version >= LocresVersion.Optimized else 0
+
+        size = 4 + extra
+        for namespace in self:
+            name = namespace.name
+            if legacy:
+                size += len(encode(name, True)) + 4
+            else:
+                data = encoded.get(name)
+                if data is None:
+                    data = encoded[name] = encode(name)
+                size += extra + len(data) + 4
+
+            for entry in namespace:
+                key = entry.key
+                data = encoded.get(key)
+                if data is None:
+                    data = encoded[key] = encode(key)
+                if legacy:
+                    size += len(data) + 4 + len(encoded[entry.translation])
+                else:
+                    size += extra + len(data) + 8
+        return size
+
+    def _text_size(self) -> int:
+        """Return the size of the string table."""
+        encoded = self._encoded
+        size = 4 + sum(len(encoded[string]) for string in self._strings)
+        if self.version >= LocresVersion.Optimized:
+            size += 4 * len(self._strings)
+        return size
+
+    def header(self, text_offset: int) -> bytes:
+        """Encode the header of a Compact or later file."""
+        return LOCRES_MAGIC + _VERSION_OFFSET.pack(self.version.value, text_offset)
 
     def write_header(self, BW: BinWriter):
         if self.version >= LocresVersion.Compact:
-            BW.write(LOCRES_MAGIC)
-            BW.uint8(self.version.value)
-            BW.write(b"\x00" * 8)
+            BW.write(self.header(0))
 
     def make_string_dict(self):
-        self._strings = {}
-        string_count = 0
+        """Deduplicate the translations and encode every distinct one once.
+
+        The encoded FStrings are cached in ``_encoded`` and reused by the key
+        and string sections, along with the names and keys encoded there.
+        """
+        self._strings = strings = {}
+        self._encoded = encoded = {}
+        encode = FString.encode
 
         for namespace in self:
             for entry in namespace:
                 string = entry.translation
+                record = strings.get(string)
+                if record is None:
+                    record = strings[string] = [0, len(strings)]
+                    encoded[string] = encode(string)
+                record[0] += 1
+                entry._string_index = record[1]
 
-                if entry.translation in self._strings:
-                    self._strings[string][0] += 1
-                else:
-                    self._strings.update({string: [1, string_count]})
-                    string_count += 1
+    def update_hashes(self):
+        """Compute the namespace and key hashes used by the current version.
 
-        for namespace in self:
-            for entry in namespace:
-                entry._string_index = self._strings[entry.translation][1]
+        Hashes read from the file, or computed by an earlier write, are kept
+        until the name or key they belong to changes, so only new and edited
+        records are hashed again.
+        """
+        version = self.version
+        if version < LocresVersion.Optimized:
+            return
 
-    def write_keys(self, BW: BinWriter):
+        if version == LocresVersion.CityHash:
+            hash_many = CityHash.hash_many
+        else:
+            hash_many = str_crc32_many
+
+        namespaces = [ns for ns in self if ns._hash_version != version]
+        hashes = hash_many([namespace.name for namespace in namespaces])
+        for namespace, value in zip(namespaces, hashes):
+            namespace._name_hash = value
+            namespace._hash_version = version
+
+        entries = [e for ns in self for e in ns if e._hash_version != version]
+        hashes = hash_many([entry.key for entry in entries])
+        for entry, value in zip(entries, hashes):
+            entry._key_hash = value
+            entry._hash_version = version
+
+        if self.stats is not None:
+            self.stats.count("hashes", len(namespaces) + len(entries))
+
+    def _key_section(self) -> Iterator[bytes]:
+        """Yield the encoded keys section, one namespace at a time."""
         keys_count = 0
         for namespace in self:
             keys_count += len(namespace)
-        if self.version >= LocresVersion.Optimized:
-            BW.uint32(keys_count)
-        BW.uint32(len(self))
+
+        pack_u32 = _U32.pack
+        pack_u32_u32 = _U32_U32.pack
+        encoded = self._encoded
+        encode = FString.encode
+
+        # Hashes come from update_hashes(), which the callers run first
+        hashed = self.version >= LocresVersion.Optimized
+        if hashed:
+            yield pack_u32_u32(keys_count, len(self))
+        else:
+            yield pack_u32(len(self))
 
         for namespace in self:
-            if self.version == LocresVersion.CityHash:
-                namespace_hash = CityHash.city_hash_64_utf16_to_uint32(namespace.name)
-                BW.uint32(namespace_hash)
-            elif self.version >= LocresVersion.Optimized:
-                namespace_hash = str_crc32(namespace.name)
-                BW.uint32(namespace_hash)
+            chunks = []
+            append = chunks.append
+            if hashed:
+                append(pack_u32(namespace._name_hash))
+
+            name = namespace.name
+            data = encoded.get(name)
+            if data is None:
+                data = encoded[name] = encode(name)
+            append(data)
+            append(pack_u32(len(namespace)))
+
+            for entry in namespace:
+                if hashed:
+                    append(pack_u32(entry._key_hash))
+
+                key = entry.key
+                data = encoded.get(key)
+                if data is None:
+                    data = encoded[key] = encode(key)
+                append(data)
+                append(pack_u32_u32(int(entry.hash), entry._string_index))
+            yield b"".join(chunks)
+
+    def _text_section(self) -> Iterator[bytes]:
+        """Yield the encoded string table, a batch of strings at a time."""
+        yield _U32.pack(len(self._strings))
+        encoded = self._encoded
+        pack_u32 = _U32.pack
+        optimized = self.version >= LocresVersion.Optimized
+
+        chunks = []
+        append = chunks.append
+        for string, (count, index) in self._strings.items():
+            append(encoded[string])
+            if optimized:
+                append(pack_u32(count))
+            if len(chunks) >= _TEXT_BATCH:
+                yield b"".join(chunks)
+                chunks.clear()
+        yield b"".join(chunks)
 
-            FString.write(BW, namespace.name)
-            BW.uint32(len(namespace))
+    def _legacy_section(self) -> Iterator[bytes]:
+        """Yield a Legacy file, translations inline, one namespace at a time."""
+        yield _U32.pack(len(self))
+        pack_u32 = _U32.pack
+        encoded = self._encoded
+        encode = FString.encode
 
+        for namespace in self:
+            chunks = [encode(namespace.name, True), pack_u32(len(namespace))]
+            append = chunks.append
             for entry in namespace:
-                if self.version == LocresVersion.CityHash:
-                    BW.uint32(CityHash.city_hash_64_utf16_to_uint32(entry.key))
-                elif self.version >= LocresVersion.Optimized:
-                    BW.uint32(str_crc32(entry.key))
+                key = entry.key
+                data = encoded.get(key)
+                if data is None:
+                    data = encoded[key] = encode(key)
+                append(data)
+                append(pack_u32(int(entry.hash)))
+                append(encoded[entry.translation])
+            yield b"".join(chunks)
+        self._encoded = {}
 
-                FString.write(BW, entry.key)
-                BW.uint32(int(entry.hash))
-                BW.uint32(entry._string_index)
+    def write_keys(self, BW: BinWriter):
+        self.update_hashes()
+        for piece in self._key_section():
+            BW.write(piece)
 
     def write_text(self, BW: BinWriter):
         text_offset = BW.get_pos()
-        with BW.at(17) as BWT: 
+        with BW.at(17) as BWT:
             BWT.uint64(text_offset)
-        BW.uint32(len(self._strings))
 
-        if self.version >= LocresVersion.Optimized:
-            for string in self._strings:
-                FString.write(BW, string)
-                BW.uint32(self._strings[string][0])
-        else:
-            for string in self._strings:
-                FString.write(BW, string)
+        for piece in self._text_section():
+            BW.write(piece)
+        self._encoded = {}
 
     def save_legacy(self, BW: BinWriter):
-        BW.uint32(len(self))
+        for piece in self._legacy_section():
+            BW.write(piece)
 
-        for namespace in self:
-            FString.write(BW, namespace.name, True)
-            BW.uint32(len(namespace))
-            for entry in namespace:
-                FString.write(BW, entry.key)
-                BW.uint32(entry.hash)
-                FString.write(BW, entry.translation)
+
+def _write_all(stream, data: bytes):
+    """Write to a binary stream or a socket, retrying short writes."""
+    if not hasattr(stream, "write") and hasattr(stream, "sendall"):
+        stream.sendall(data)
+        return
+
+    view = memoryview(data)
+    while view:
+        written = stream.write(view)
+        if written is None:
+            # Streams that do not report a count write everything
+            return
+        view = view[written:]
+
+
+def _read_file(cls, file, lazy, columnar, namespaces, key_filter):
+    locres = cls()
+    locres.read(file, lazy, columnar, namespaces, key_filter)
+    return locres
 
 
 def entry_hash(text):
     return CityHash.city_hash_64_utf16_to_uint32(text)
+
+
+def entry_hash_many(texts):
+    return CityHash.hash_many(texts)
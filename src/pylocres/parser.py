@@ -0,0 +1,370 @@
+import mmap
+import struct
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, Container, Iterator
+
+LOCRES_MAGIC = b"\x0e\x14\x74\x75\x67\x4a\x03\xfc\x4a\x15\x90\x9d\xc3\x37\x7f\x1b"
+
+_HEADER = struct.Struct("<BQ")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_U32_I32 = struct.Struct("<Ii")
+_U32_U32 = struct.Struct("<II")
+
+
+class LocresVersion(IntEnum):
+    Legacy = 0
+    Compact = 1
+    Optimized = 2
+    CityHash = 3
+
+
+class LocresParser:
+    """
+    Parser that walks a whole .locres image held in one buffer.
+
+    Fields are unpacked with precompiled struct formats straight from the
+    buffer and ASCII FStrings are sliced out of a section decoded in one go,
+    instead of going through a reader call per field.
+
+    :param data: The file contents (bytes, bytearray or a read-only mmap)
+    """
+
+    def __init__(self, data: bytes | bytearray | mmap.mmap):
+        self.data = data
+        self.size = len(data)
+
+        if self.size >= 25 and data[:16] == LOCRES_MAGIC:
+            version, self.offset = _HEADER.unpack_from(data, 16)
+            self.version = LocresVersion(version)
+            self.keys_pos = 25
+        else:
+            self.version = LocresVersion.Legacy
+            self.offset = None
+            self.keys_pos = 0
+
+    @classmethod
+    def from_file(cls, file: str | bytes | Path, use_mmap: bool = False):
+        """Create a parser for a path or an in-memory file.
+
+        :param file: Path to a .locres file, or its contents
+        :param use_mmap: Map the file instead of reading it into memory
+        """
+        if isinstance(file, (bytes, bytearray)):
+            return cls(file)
+        if not isinstance(file, (str, Path)):
+            raise ValueError("File must be: str(path), bytes, or bytearray.")
+
+        with open(file, "rb") as f:
+            if use_mmap and Path(file).stat().st_size:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            return cls(f.read())
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _check(self, pos: int):
+        if pos > self.size:
+            raise EOFError("Attempt to read beyond the end of the file.")
+
+    def read_string(self, pos: int) -> str:
+        """Decode the FString stored at the given position."""
+        data = self.data
+        length = _I32.unpack_from(data, pos)[0]
+        pos += 4
+        if length > 0:
+            self._check(pos + length)
+            return data[pos : pos + length - 1].decode("ascii", errors="replace")
+        elif length < 0:
+            size = length * -2
+            self._check(pos + size)
+            return data[pos : pos + size - 2].decode("utf-16le", errors="replace")
+        return ""
+
+    def read_strings(self) -> list[str]:
+        """Decode the whole string table of a Compact or later file."""
+        data = self.data
+        pos = self.offset
+        string_count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+
+        # ASCII strings are sliced out of the section decoded once
+        base = pos
+        text = data[pos:].decode("latin-1")
+        stride = 4 if self.version >= LocresVersion.Optimized else 0
+
+        strings = []
+        append = strings.append
+        unpack = _I32.unpack_from
+
+        for i in range(string_count):
+            length = unpack(data, pos)[0]
+            pos += 4
+            if length > 0:
+                string = text[pos - base : pos - base + length - 1]
+                if not string.isascii():
+                    string = data[pos : pos + length - 1].decode(
+                        "ascii", errors="replace"
+                    )
+                pos += length
+            elif length < 0:
+                size = length * -2
+                string = data[pos : pos + size - 2].decode(
+                    "utf-16le", errors="replace"
+                )
+                pos += size
+            else:
+                string = ""
+            pos += stride
+            append(string)
+
+        self._check(pos)
+        return strings
+
+    def string_offsets(self) -> list[int]:
+        """Return the position of every FString in the string table."""
+        data = self.data
+        pos = self.offset
+        string_count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+
+        stride = 4 if self.version >= LocresVersion.Optimized else 0
+        offsets = []
+        append = offsets.append
+        unpack = _I32.unpack_from
+
+        for i in range(string_count):
+            append(pos)
+            length = unpack(data, pos)[0]
+            pos += 4 + stride + (length if length >= 0 else length * -2)
+
+        self._check(pos)
+        return offsets
+
+    def iter_namespaces(
+        self,
+        values: bool = True,
+        namespaces: Container[str] | None = None,
+        key_filter: Callable[[str, str], bool] | None = None,
+    ) -> Iterator[tuple]:
+        """Walk the keys section one namespace at a time.
+
+        Yields ``(namespace_hash, name, keys)`` where ``keys`` is a list of
+        ``(key_hash, key, source_hash, value)`` tuples. Hashes are ``None``
+        before the Optimized version. ``value`` is the string table index for
+        Compact and later and the translation for Legacy. When ``values`` is
+        false it is instead the position of the index field or of the
+        translation FString.
+
+        :param namespaces: Only yield the namespaces with these names, the
+            others are skipped over using their length prefixes
+        :param key_filter: Only keep the keys for which
+            ``key_filter(namespace, key)`` is true. Namespaces left without
+            keys are not yielded.
+        """
+        if namespaces is None and key_filter is None:
+            return self._walk_keys(values, None, False)
+        return self._walk_selected(values, namespaces, key_filter)
+
+    def iter_entries(self, strings: list[str] | None = None) -> Iterator[tuple]:
+        """Walk the keys section one entry at a time.
+
+        Yields ``(namespace, key, source_hash, translation)`` tuples and
+        builds nothing per namespace. For Compact and later ``strings`` must
+        be the decoded string table.
+        """
+        return self._walk_keys(True, strings, True)
+
+    def _walk_keys(self, values, strings, flat) -> Iterator[tuple]:
+        data = self.data
+        version = self.version
+        pos = self.keys_pos
+        end = self.offset if version >= LocresVersion.Compact else self.size
+
+        hashed = version >= LocresVersion.Optimized
+        compact = version >= LocresVersion.Compact
+
+        # ASCII keys and translations are sliced out of the section decoded
+        # once. A mapped Legacy file holds every translation in this section,
+        # so its strings are decoded one by one instead of copying it all.
+        base = pos
+        text = None
+        if compact or not isinstance(data, mmap.mmap):
+            text = data[pos:end].decode("latin-1")
+
+        unpack_i32 = _I32.unpack_from
+        unpack_u32 = _U32.unpack_from
+        unpack_hash_length = _U32_I32.unpack_from
+        unpack_pair = _U32_U32.unpack_from
+        read_string = self.read_string
+
+        if hashed:
+            pos += 4
+        namespace_count = unpack_u32(data, pos)[0]
+        pos += 4
+
+        for i in range(namespace_count):
+            namespace_hash = None
+            if hashed:
+                namespace_hash = unpack_u32(data, pos)[0]
+                pos += 4
+            name = read_string(pos)
+            length = unpack_i32(data, pos)[0]
+            pos += 4 + (length if length >= 0 else length * -2)
+
+            key_count = unpack_u32(data, pos)[0]
+            pos += 4
+
+            if not flat:
+                keys = []
+                append = keys.append
+
+            for j in range(key_count):
+                if hashed:
+                    key_hash, length = unpack_hash_length(data, pos)
+                    pos += 8
+                else:
+                    key_hash = None
+                    length = unpack_i32(data, pos)[0]
+                    pos += 4
+
+                if length > 0 and text is not None:
+                    key = text[pos - base : pos - base + length - 1]
+                    if not key.isascii():
+                        key = data[pos : pos + length - 1].decode(
+                            "ascii", errors="replace"
+                        )
+                    pos += length
+                elif length:
+                    key = read_string(pos - 4)
+                    pos += length if length > 0 else length * -2
+                else:
+                    key = ""
+
+                if compact:
+                    source_hash, value = unpack_pair(data, pos)
+                    if not values:
+                        value = pos + 4
+                    pos += 8
+                else:
+                    source_hash, length = unpack_hash_length(data, pos)
+                    if not values:
+                        value = pos + 4
+                    pos += 8
+                    if values and length > 0 and text is not None:
+                        value = text[pos - base : pos - base + length - 1]
+                        if not value.isascii():
+                            value = data[pos : pos + length - 1].decode(
+                                "ascii", errors="replace"
+                            )
+                    elif values:
+                        value = read_string(pos - 4)
+                    pos += length if length >= 0 else length * -2
+
+                if not flat:
+                    append((key_hash, key, source_hash, value))
+                elif compact:
+                    yield name, key, source_hash, strings[value]
+                else:
+                    yield name, key, source_hash, value
+
+            self._check(pos)
+            if not flat:
+                yield namespace_hash, name, keys
+
+
+    def _walk_selected(self, values, namespaces, key_filter) -> Iterator[tuple]:
+        data = self.data
+        version = self.version
+        pos = self.keys_pos
+        hashed = version >= LocresVersion.Optimized
+        compact = version >= LocresVersion.Compact
+
+        unpack_i32 = _I32.unpack_from
+        unpack_u32 = _U32.unpack_from
+        unpack_hash_length = _U32_I32.unpack_from
+        unpack_pair = _U32_U32.unpack_from
+        read_string = self.read_string
+
+        # Bytes before a key FString and after it up to the next FString
+        key_start = 4 if hashed else 0
+        key_end = 8 if compact else 4
+
+        if hashed:
+            pos += 4
+        namespace_count = unpack_u32(data, pos)[0]
+        pos += 4
+
+        for i in range(namespace_count):
+            namespace_hash = None
+            if hashed:
+                namespace_hash = unpack_u32(data, pos)[0]
+                pos += 4
+            name = read_string(pos)
+            length = unpack_i32(data, pos)[0]
+            pos += 4 + (length if length >= 0 else length * -2)
+
+            key_count = unpack_u32(data, pos)[0]
+            pos += 4
+
+            if namespaces is not None and name not in namespaces:
+                for j in range(key_count):
+                    length = unpack_i32(data, pos + key_start)[0]
+                    pos += key_start + 4 + (length if length >= 0 else length * -2)
+                    pos += key_end
+                    if not compact:
+                        length = unpack_i32(data, pos)[0]
+                        pos += 4 + (length if length >= 0 else length * -2)
+                self._check(pos)
+                continue
+
+            keys = []
+            append = keys.append
+            for j in range(key_count):
+                key_hash = unpack_u32(data, pos)[0] if hashed else None
+                pos += key_start
+                key = read_string(pos)
+                length = unpack_i32(data, pos)[0]
+                pos += 4 + (length if length >= 0 else length * -2)
+
+                if compact:
+                    source_hash, value = unpack_pair(data, pos)
+                    if not values:
+                        value = pos + 4
+                    pos += 8
+                else:
+                    source_hash, length = unpack_hash_length(data, pos)
+                    value = pos + 4
+                    pos += 8 + (length if length >= 0 else length * -2)
+
+                if key_filter is None or key_filter(name, key):
+                    if values and not compact:
+                        value = read_string(value)
+                    append((key_hash, key, source_hash, value))
+
+            self._check(pos)
+            if keys or key_filter is None:
+                yield namespace_hash, name, keys
+
+
+def iter_entries(file: str | bytes | Path) -> Iterator[tuple[str, str, int, str]]:
+    """Yield ``(namespace, key, source_hash, translation)`` for every entry.
+
+    The file is walked straight from its binary layout, without building
+    namespaces or entries.
+
+    :param file: Path to a .locres file, or its contents
+    """
+    with LocresParser.from_file(file, use_mmap=True) as parser:
+        strings = None
+        if parser.version >= LocresVersion.Compact:
+            strings = parser.read_strings()
+        yield from parser.iter_entries(strings)
@@ -0,0 +1,164 @@
+import re
+import textwrap
+from pathlib import Path
+from typing import Iterator, TextIO
+
+# Buffer size of the streamed .po files
+BUFFER_SIZE = 1024 * 1024
+
+WRAP_WIDTH = 78
+
+_ESCAPES = {
+    "\\": "\\",
+    "\t": "t",
+    "\r": "r",
+    "\n": "n",
+    "\v": "v",
+    "\b": "b",
+    "\f": "f",
+    '"': '"',
+}
+_UNESCAPES = {code: char for char, code in _ESCAPES.items()}
+_UNESCAPE = re.compile(r'\\([\\ntrvbf"])')
+
+
+def escape(text: str) -> str:
+    # Chained replaces are faster than str.translate for short strings
+    return (
+        text.replace("\\", r"\\")
+        .replace("\t", r"\t")
+        .replace("\r", r"\r")
+        .replace("\n", r"\n")
+        .replace("\v", r"\v")
+        .replace("\b", r"\b")
+        .replace("\f", r"\f")
+        .replace('"', r"\"")
+    )
+
+
+def unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    return _UNESCAPE.sub(lambda match: _UNESCAPES[match.group(1)], text)
+
+
+def format_field(name: str, value: str, wrap_width: int = WRAP_WIDTH) -> str:
+    """Format a ``msgid``-like field the way polib does, newline included."""
+    lines = value.splitlines(True)
+    if len(lines) <= 1:
+        escaped = escape(value)
+        # Escapes do not count towards the width, as in polib
+        width = wrap_width - len(name) - 3 + len(escaped) - len(value)
+        if wrap_width <= 0 or len(value) <= width:
+            return f'{name} "{escaped}"\n'
+        lines = [
+            unescape(line)
+            for line in textwrap.wrap(
+                escaped,
+                wrap_width - 2,
+                drop_whitespace=False,
+                break_long_words=False,
+            )
+        ]
+
+    return f'{name} ""\n' + "".join([f'"{escape(line)}"\n' for line in lines])
+
+
+class PoWriter:
+    """
+    Write a .po file entry by entry, without building a catalog in memory.
+
+    The output matches what polib writes for the same entries.
+
+    ```python
+    with PoWriter("Game.po") as writer:
+        writer.add("UI,PlayButton", "Play")
+    ```
+
+    :param file: Path of the .po file, or a text stream
+    """
+
+    def __init__(self, file: str | Path | TextIO):
+        if isinstance(file, (str, Path)):
+            self._file = open(file, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self._file.write('#\nmsgid ""\nmsgstr ""\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, msgctxt: str | None, msgid: str, msgstr: str = ""):
+        """Write one message."""
+        parts = ["\n"]
+        if msgctxt is not None:
+            parts.append(format_field("msgctxt", msgctxt))
+        parts.append(format_field("msgid", msgid))
+        parts.append(format_field("msgstr", msgstr))
+        self._file.write("".join(parts))
+
+    def close(self):
+        if self._owns_file and not self._file.closed:
+            self._file.close()
+
+
+def iter_po(file: str | Path | TextIO) -> Iterator[tuple[str | None, str, str]]:
+    """Yield ``(msgctxt, msgid, msgstr)`` for every message of a .po file.
+
+    The file is parsed line by line. Only the subset pylocres writes is
+    understood: comments are ignored, obsolete (``#~``) messages and the
+    header are skipped, and ``msgstr[0]`` stands in for ``msgstr``.
+
+    :param file: Path of the .po file, or a text stream
+    """
+    if isinstance(file, (str, Path)):
+        with open(file, "r", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+            yield from iter_po(f)
+        return
+
+    fields = {}
+    current = None
+
+    def message():
+        msgid = fields.get("msgid")
+        msgctxt = fields.get("msgctxt")
+        if msgid is None or (msgid == "" and msgctxt is None):
+            return None
+        msgstr = fields.get("msgstr", fields.get("msgstr[0]", ""))
+        return msgctxt, msgid, msgstr
+
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+
+        if line[0] == '"':
+            if current is None:
+                raise ValueError(f"Line {number}: string outside of a field")
+            fields[current] += unescape(line[1:-1])
+            continue
+
+        name, _, value = line.partition(" ")
+        if name in ("msgctxt", "msgid") and (
+            "msgstr" in fields or "msgstr[0]" in fields
+        ):
+            # A new message starts
+            entry = message()
+            if entry is not None:
+                yield entry
+            fields = {}
+
+        value = value.strip()
+        if len(value) < 2 or value[0] != '"' or value[-1] != '"':
+            raise ValueError(f"Line {number}: expected a quoted string")
+        current = name
+        fields[name] = unescape(value[1:-1])
+
+    entry = message()
+    if entry is not None:
+        yield entry
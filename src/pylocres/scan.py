@@ -0,0 +1,153 @@
+import heapq
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from .parser import LocresParser, LocresVersion, _I32, _U32, _U32_U32
+
+
+class StringStats(NamedTuple):
+    size: int  # bytes of the string table, or of the inline translations
+    ascii: int
+    utf16: int
+    ascii_bytes: int
+    utf16_bytes: int
+    largest: list[tuple[int, str]]  # (characters, text), longest first
+
+
+class LocresScan(NamedTuple):
+    path: str
+    version: LocresVersion
+    size: int
+    namespaces: int
+    entries: int
+    strings: int  # distinct translations, every entry has its own before Compact
+    string_stats: StringStats | None = None
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Entries per stored translation."""
+        return self.entries / self.strings if self.strings else 1.0
+
+
+def _value_positions(parser: LocresParser) -> Iterator[int]:
+    """Yield the position of every entry's value, stepping over the keys
+    section of a file older than Optimized by its length prefixes only.
+
+    The value is the string index for Compact and the translation FString
+    for Legacy.
+    """
+    data = parser.data
+    compact = parser.version >= LocresVersion.Compact
+    unpack_i32 = _I32.unpack_from
+    unpack_u32 = _U32.unpack_from
+    pos = parser.keys_pos
+
+    namespace_count = unpack_u32(data, pos)[0]
+    pos += 4
+    for i in range(namespace_count):
+        length = unpack_i32(data, pos)[0]
+        pos += 4 + (length if length >= 0 else length * -2)
+        key_count = unpack_u32(data, pos)[0]
+        pos += 4
+
+        for j in range(key_count):
+            length = unpack_i32(data, pos)[0]
+            pos += 8 + (length if length >= 0 else length * -2)
+            yield pos
+            if compact:
+                pos += 4
+            else:
+                length = unpack_i32(data, pos)[0]
+                pos += 4 + (length if length >= 0 else length * -2)
+        parser._check(pos)
+
+
+def _table_positions(parser: LocresParser) -> Iterator[int]:
+    """Yield the position of every FString in the string table."""
+    data = parser.data
+    unpack = _I32.unpack_from
+    stride = 4 if parser.version >= LocresVersion.Optimized else 0
+    pos = parser.offset
+    string_count = _U32.unpack_from(data, pos)[0]
+    pos += 4
+
+    for i in range(string_count):
+        yield pos
+        length = unpack(data, pos)[0]
+        pos += 4 + stride + (length if length >= 0 else length * -2)
+    parser._check(pos)
+
+
+def _string_stats(parser: LocresParser, positions, largest: int) -> StringStats:
+    data = parser.data
+    unpack = _I32.unpack_from
+    count = ascii = utf16 = ascii_bytes = utf16_bytes = 0
+    # (characters, position) of the longest strings seen so far
+    longest = []
+
+    for pos in positions:
+        count += 1
+        length = unpack(data, pos)[0]
+        if length >= 0:
+            ascii += 1
+            ascii_bytes += length
+            characters = length - 1 if length else 0
+        else:
+            utf16 += 1
+            utf16_bytes += length * -2
+            characters = -length - 1
+        if len(longest) < largest:
+            heapq.heappush(longest, (characters, pos))
+        elif largest and characters > longest[0][0]:
+            heapq.heapreplace(longest, (characters, pos))
+
+    if parser.version >= LocresVersion.Compact:
+        size = parser.size - parser.offset
+    else:
+        size = 4 * count + ascii_bytes + utf16_bytes
+    longest = [
+        (characters, parser.read_string(pos))
+        for characters, pos in sorted(longest, reverse=True)
+    ]
+    return StringStats(size, ascii, utf16, ascii_bytes, utf16_bytes, longest)
+
+
+def scan(file: str | bytes | Path, stats: bool = False, largest: int = 5) -> LocresScan:
+    """Read the counts of a .locres file without decoding any string.
+
+    Optimized and later files store the entry count after the header, so
+    only fixed fields are read. Older files are stepped through by their
+    length prefixes.
+
+    :param file: Path to a .locres file, or its contents
+    :param stats: Also gather :class:`StringStats` in one pass over the
+        length prefixes of the translations
+    :param largest: Number of longest strings to decode for the stats
+    """
+    with LocresParser.from_file(file, use_mmap=True) as parser:
+        data = parser.data
+        version = parser.version
+        path = str(file) if isinstance(file, (str, Path)) else "<bytes>"
+
+        if version >= LocresVersion.Optimized:
+            entries, namespaces = _U32_U32.unpack_from(data, parser.keys_pos)
+        else:
+            namespaces = _U32.unpack_from(data, parser.keys_pos)[0]
+            entries = sum(1 for _ in _value_positions(parser))
+
+        if version >= LocresVersion.Compact:
+            strings = _U32.unpack_from(data, parser.offset)[0]
+        else:
+            strings = entries
+
+        string_stats = None
+        if stats:
+            if version >= LocresVersion.Compact:
+                positions = _table_positions(parser)
+            else:
+                positions = _value_positions(parser)
+            string_stats = _string_stats(parser, positions, largest)
+
+        return LocresScan(
+            path, version, parser.size, namespaces, entries, strings, string_stats
+        )
@@ -0,0 +1,60 @@
+import time
+from typing import Callable
+
+
+class LocresStats:
+    """
+    Wall time and size of every read/write phase, plus counters.
+
+    Assign an instance to ``LocresFile.stats`` (or pass it to the
+    ``pylocres.convert`` functions) to record it. With no stats object set,
+    each phase costs a single attribute check.
+
+    Phases: ``read_header`` (includes loading or mapping the file),
+    ``read_strings``, ``read_keys``, ``write_header``, ``make_string_dict``,
+    ``update_hashes``, ``write_keys``, ``write_text``, ``save_legacy``.
+    Counters: ``namespaces``, ``entries``, ``strings``, ``duplicates``,
+    ``hashes``.
+
+    :param hook: Called as ``hook(phase, seconds, size)`` after every phase
+    """
+
+    def __init__(self, hook: Callable[[str, float, int], None] | None = None):
+        self.hook = hook
+        self.phases: dict[str, dict] = {}
+        self.counters: dict[str, int] = {}
+
+    @staticmethod
+    def start() -> float:
+        return time.perf_counter()
+
+    def record(self, phase: str, start: float, size: int = 0):
+        """Add the time since ``start`` and ``size`` bytes to a phase."""
+        seconds = time.perf_counter() - start
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = {"seconds": 0.0, "bytes": 0, "calls": 0}
+        stats["seconds"] += seconds
+        stats["bytes"] += size
+        stats["calls"] += 1
+        if self.hook is not None:
+            self.hook(phase, seconds, size)
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        self.phases = {}
+        self.counters = {}
+
+    def report(self) -> str:
+        """Format the phases and counters as a table."""
+        lines = [f"{'phase':<18}{'calls':>7}{'ms':>12}{'bytes':>14}"]
+        for phase, stats in self.phases.items():
+            lines.append(
+                f"{phase:<18}{stats['calls']:>7}"
+                f"{stats['seconds'] * 1000:>12.2f}{stats['bytes']:>14}"
+            )
+        for name, value in self.counters.items():
+            lines.append(f"{name:<18}{value:>7}")
+        return "\n".join(lines)
@@ -0,0 +1,190 @@
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from .batch import find_files
+from .city_hash import CityHash
+from .crc_hash import str_crc32_many
+from .parser import LocresParser, LocresVersion
+
+# Strings hashed per worker task
+BATCH_SIZE = 50_000
+
+
+class HashMismatch(NamedTuple):
+    kind: str  # "namespace", "key" or "source"
+    namespace: str
+    key: str | None
+    stored: int
+    expected: int
+
+
+class HashCollision(NamedTuple):
+    hash: int
+    namespace: str
+    key: str | None  # None for two namespaces sharing a name hash
+    other: str
+
+
+class VerifyResult(NamedTuple):
+    path: str
+    version: LocresVersion | None
+    entries: int
+    mismatches: list[HashMismatch]
+    collisions: list[HashCollision]
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.mismatches and not self.collisions
+
+
+def _hash_batch(version: LocresVersion, strings: list[str]) -> list[int]:
+    if version == LocresVersion.CityHash:
+        return CityHash.hash_many(strings)
+    return str_crc32_many(strings)
+
+
+def _source_hashes(file: str | Path) -> dict[tuple[str, str], int]:
+    with LocresParser.from_file(file, use_mmap=True) as parser:
+        return {
+            (name, key): source_hash
+            for _, name, keys in parser.iter_namespaces(values=False)
+            for _, key, source_hash, _ in keys
+        }
+
+
+def verify(
+    path: str | Path,
+    source_file: str | Path | dict | None = None,
+    executor: Executor | None = None,
+) -> VerifyResult:
+    """Check the stored hashes of a .locres file without building a LocresFile.
+
+    Namespace and key hashes of Optimized and later files are recomputed and
+    compared, and names or keys sharing a hash are reported as collisions.
+    Translations are never decoded.
+
+    :param path: The .locres file to check
+    :param source_file: Source language .locres whose source hashes the
+        entries should match (or its ``(namespace, key) -> hash`` dict)
+    :param executor: Hash in batches of :data:`BATCH_SIZE` on this executor
+    """
+    start = time.perf_counter()
+    mismatches = []
+    collisions = []
+
+    with LocresParser.from_file(path, use_mmap=True) as parser:
+        version = parser.version
+        namespaces = list(parser.iter_namespaces(values=False))
+    entries = sum(len(keys) for _, _, keys in namespaces)
+
+    if version >= LocresVersion.Optimized:
+        strings = []
+        for _, name, keys in namespaces:
+            strings.append(name)
+            strings.extend(key for _, key, _, _ in keys)
+
+        batches = [
+            strings[i : i + BATCH_SIZE] for i in range(0, len(strings), BATCH_SIZE)
+        ]
+        if executor is not None and len(batches) > 1:
+            hashed = executor.map(_hash_batch, repeat(version), batches)
+        else:
+            hashed = map(_hash_batch, repeat(version), batches)
+        expected = iter([value for batch in hashed for value in batch])
+
+        names = {}
+        for name_hash, name, keys in namespaces:
+            value = next(expected)
+            if name_hash != value:
+                mismatches.append(
+                    HashMismatch("namespace", name, None, name_hash, value)
+                )
+            other = names.setdefault(name_hash, name)
+            if other != name:
+                collisions.append(HashCollision(name_hash, name, None, other))
+
+            seen = {}
+            for key_hash, key, _, _ in keys:
+                value = next(expected)
+                if key_hash != value:
+                    mismatches.append(HashMismatch("key", name, key, key_hash, value))
+                other = seen.setdefault(key_hash, key)
+                if other != key:
+                    collisions.append(HashCollision(key_hash, name, key, other))
+
+    if source_file is not None:
+        if not isinstance(source_file, dict):
+            source_file = _source_hashes(source_file)
+        for _, name, keys in namespaces:
+            for _, key, source_hash, _ in keys:
+                value = source_file.get((name, key))
+                if value is not None and value != source_hash:
+                    mismatches.append(
+                        HashMismatch("source", name, key, source_hash, value)
+                    )
+
+    seconds = time.perf_counter() - start
+    return VerifyResult(str(path), version, entries, mismatches, collisions, seconds)
+
+
+def _verify_one(path, source_hashes, executor=None) -> VerifyResult:
+    try:
+        return verify(path, source_hashes, executor)
+    except Exception as e:
+        return VerifyResult(path, None, 0, [], [], 0.0, str(e))
+
+
+def verify_batch(
+    path: str | Path,
+    source_file: str | Path | None = None,
+    jobs: int | None = None,
+    callback: Callable[[VerifyResult], None] | None = None,
+) -> list[VerifyResult]:
+    """Verify many .locres files on a process pool.
+
+    A single file is verified in this process with its hashing spread over
+    the pool instead.
+
+    :param path: A directory, a glob pattern or a single file
+    :param source_file: Source language .locres the source hashes should match
+    :param jobs: Number of worker processes, all CPUs by default
+    :param callback: Called with each result as soon as its file is done
+    :return: A result per file, in input order
+    """
+    files = [str(file) for file in find_files(path, ".locres")]
+    if not files:
+        return []
+
+    source_hashes = _source_hashes(source_file) if source_file is not None else None
+    jobs = jobs or os.cpu_count() or 1
+    results = [None] * len(files)
+
+    if jobs == 1 or len(files) == 1:
+        executor = ProcessPoolExecutor(jobs) if jobs > 1 else None
+        try:
+            for i, file in enumerate(files):
+                results[i] = _verify_one(file, source_hashes, executor)
+                if callback is not None:
+                    callback(results[i])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return results
+
+    with ProcessPoolExecutor(min(jobs, len(files))) as executor:
+        futures = {
+            executor.submit(_verify_one, file, source_hashes): i
+            for i, file in enumerate(files)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if callback is not None:
+                callback(result)
+    return results
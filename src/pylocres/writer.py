@@ -0,0 +1,195 @@
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from .city_hash import CityHash
+from .crc_hash import str_crc32, str_crc32_many
+from .file_io import FString
+from .parser import LOCRES_MAGIC, LocresVersion
+
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_U32_U32 = struct.Struct("<II")
+
+
+class LocresWriter:
+    """
+    Write a .locres file record by record, without building a LocresFile.
+
+    Key records are written as soon as they are added and translations are
+    deduplicated on the fly; the string table is written when the writer is
+    closed. Every namespace has to be written in one go.
+
+    ```python
+    with LocresWriter("Game.locres") as writer:
+        writer.begin_namespace("UI")
+        writer.add("PlayButton", entry_hash("Play"), "Грати")
+    ```
+
+    :param file: Path of the .locres file, or a seekable binary stream
+    :param version: The version of the file to write
+    """
+
+    def __init__(
+        self,
+        file: str | Path | BinaryIO,
+        version: LocresVersion = LocresVersion.CityHash,
+    ):
+        self.version = LocresVersion(version)
+
+        if isinstance(file, (str, Path)):
+            self._file = open(file, "wb")
+            self._owns_file = True
+        else:
+            if not file.seekable():
+                raise ValueError("LocresWriter needs a seekable stream")
+            self._file = file
+            self._owns_file = False
+
+        if self.version == LocresVersion.CityHash:
+            self._hash = CityHash.city_hash_64_utf16_to_uint32
+            self._hash_many = CityHash.hash_many
+        elif self.version == LocresVersion.Optimized:
+            self._hash = str_crc32
+            self._hash_many = str_crc32_many
+        else:
+            self._hash = None
+            self._hash_many = None
+
+        self._start = self._file.tell()
+        self._strings: dict[str, list[int]] = {}
+        self._names = set()
+        self._keys_count = 0
+        self._key_count = 0
+        self._key_count_pos = None
+        self._closed = False
+
+        if self.version >= LocresVersion.Compact:
+            self._file.write(LOCRES_MAGIC)
+            self._file.write(bytes((self.version.value,)))
+            self._file.write(b"\x00" * 8)
+        if self.version >= LocresVersion.Optimized:
+            self._file.write(b"\x00" * 4)
+        self._namespace_count_pos = self._file.tell()
+        self._file.write(b"\x00" * 4)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._owns_file:
+            self._file.close()
+
+    def _patch(self, pos: int, data: bytes):
+        end = self._file.tell()
+        self._file.seek(pos)
+        self._file.write(data)
+        self._file.seek(end)
+
+    def _end_namespace(self):
+        if self._key_count_pos is not None:
+            self._patch(self._key_count_pos, _U32.pack(self._key_count))
+            self._key_count_pos = None
+
+    def begin_namespace(self, name: str, name_hash: int | None = None):
+        """Start a new namespace; the following keys are added to it.
+
+        :param name_hash: Hash of the name for this version, computed if omitted
+        """
+        if self._closed:
+            raise ValueError("LocresWriter is closed")
+        if name in self._names:
+            raise ValueError(f"Namespace [{name}] was already written")
+        self._end_namespace()
+        self._names.add(name)
+
+        write = self._file.write
+        if self._hash is not None:
+            if name_hash is None:
+                name_hash = self._hash(name)
+            write(_U32.pack(name_hash))
+        write(FString.encode(name, self.version == LocresVersion.Legacy))
+        self._key_count_pos = self._file.tell()
+        self._key_count = 0
+        write(b"\x00" * 4)
+
+    def add(
+        self,
+        key: str,
+        source_hash: int,
+        translation: str,
+        key_hash: int | None = None,
+    ):
+        """Add an entry to the current namespace.
+
+        :param key_hash: Hash of the key for this version, computed if omitted
+        """
+        if self._key_count_pos is None:
+            raise ValueError("begin_namespace() must be called before add()")
+
+        write = self._file.write
+        if self._hash is not None:
+            if key_hash is None:
+                key_hash = self._hash(key)
+            write(_U32.pack(key_hash))
+        write(FString.encode(key))
+
+        if self.version == LocresVersion.Legacy:
+            write(_U32.pack(int(source_hash)))
+            write(FString.encode(translation))
+        else:
+            string = self._strings.get(translation)
+            if string is None:
+                string = self._strings[translation] = [0, len(self._strings)]
+            string[0] += 1
+            write(_U32_U32.pack(int(source_hash), string[1]))
+
+        self._key_count += 1
+        self._keys_count += 1
+
+    def write_namespace(self, name: str, entries: Iterable[tuple[str, int, str]]):
+        """Write a whole namespace of ``(key, source_hash, translation)`` entries.
+
+        The keys are hashed in one batch.
+        """
+        self.begin_namespace(name)
+        if self._hash_many is None:
+            for key, source_hash, translation in entries:
+                self.add(key, source_hash, translation)
+            return
+
+        # Iterated twice, generators have to be materialized
+        entries = list(entries)
+        key_hashes = self._hash_many([key for key, _, _ in entries])
+        for (key, source_hash, translation), key_hash in zip(entries, key_hashes):
+            self.add(key, source_hash, translation, key_hash)
+
+    def close(self):
+        """Write the string table, patch the counts and offsets and close."""
+        if self._closed:
+            return
+        self._closed = True
+        self._end_namespace()
+
+        file = self._file
+        self._patch(self._namespace_count_pos, _U32.pack(len(self._names)))
+
+        if self.version >= LocresVersion.Optimized:
+            self._patch(self._start + 25, _U32.pack(self._keys_count))
+
+        if self.version >= LocresVersion.Compact:
+            text_offset = file.tell() - self._start
+            self._patch(self._start + 17, _U64.pack(text_offset))
+            file.write(_U32.pack(len(self._strings)))
+
+            optimized = self.version >= LocresVersion.Optimized
+            for string, (count, index) in self._strings.items():
+                file.write(FString.encode(string))
+                if optimized:
+                    file.write(_U32.pack(count))
+
+        self._strings = {}
+        if self._owns_file:
+            file.close()
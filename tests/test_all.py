@@ -1,6 +1,39 @@
-from pylocres import LocresFile, LocresVersion
+import asyncio
+import io
+import os
+import random
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from binsl import BinReader, BinWriter
+
+from pylocres import (
+    ColumnarNamespace,
+    Entry,
+    LocmetaFile,
+    LocresCollection,
+    LocresFile,
+    LocresHashIndex,
+    LocresStats,
+    LocresVersion,
+    LocresWriter,
+    Namespace,
+    SnapshotCache,
+    entry_hash,
+    iter_entries,
+    scan,
+)
+from pylocres import aio
+from pylocres.batch import convert_batch, find_files
+from pylocres.convert import csv_to_locres, locres_to_csv, locres_to_po, po_to_locres
 from pylocres.city_hash import CityHash
-from pylocres.crc_hash import str_crc32
+from pylocres.crc_hash import str_crc32, str_crc32_many, str_crc32_reference
+from pylocres.diff import diff
+from pylocres.file_io import FString
+from pylocres.po import PoWriter, iter_po
+from pylocres.verify import verify, verify_batch
 
 
 def test_city_hash_values():
@@ -20,6 +53,34 @@ def test_city_hash_values():
         assert result == expected_hash
 
 
+def test_city_hash_many():
+    test_cases = [
+        ("", 0),
+        ("I", 366061642),
+        ("HI", 4113122066),
+        ("List", 2316514818),
+        ("Tests Tests", 2426432524),
+        ("a" * 17, 3926091141),
+        ("Test" * 20, 3317857492),
+    ]
+
+    values = [value for value, _ in test_cases]
+    expected = [expected_hash for _, expected_hash in test_cases]
+    assert CityHash.hash_many(values + values) == expected + expected
+
+
+def test_city_hash_matches_reference():
+    rng = random.Random(0)
+    alphabet = "abcXYZ 019_-.ßїé中\U0001F600"
+
+    for length in range(0, 200):
+        for i in range(5):
+            value = "".join(rng.choice(alphabet) for _ in range(length))
+            assert CityHash.city_hash_64(value) == CityHash.city_hash_64_reference(
+                value
+            )
+
+
 def test_crc_hash_values():
 
     test_cases = [
@@ -34,6 +95,43 @@ def test_crc_hash_values():
         assert result == expected_hash
 
 
+def test_crc_hash_many():
+    test_cases = [
+        ("Test crc", 2908429949),
+        ("Locres", 1425315323),
+        ("A" * 100, 2416283133),
+        ("ABC" * 100, 426380042),
+    ]
+
+    values = [value for value, _ in test_cases]
+    expected = [expected_hash for _, expected_hash in test_cases]
+    assert str_crc32_many(values) == expected
+
+
+def test_crc_hash_matches_reference():
+    rng = random.Random(0)
+    alphabet = "abcXYZ 019_-.ßїé中\U0001F600\ud800"
+
+    for length in range(0, 100):
+        value = "".join(rng.choice(alphabet) for _ in range(length))
+        assert str_crc32(value) == str_crc32_reference(value)
+        assert str_crc32(value, 1234) == str_crc32_reference(value, 1234)
+
+
+def test_fstring_roundtrip():
+    values = ["", "Play", "Грати", "tab\tend", "\u5263 \u76fe"]
+    data = b"".join(FString.encode(value) for value in values)
+    data += FString.encode("Play", use_unicode=True)
+
+    with BinReader(data) as BR:
+        assert [FString.read(BR) for _ in values] == values
+        assert FString.read(BR) == "Play"
+        assert BR.get_pos() == len(data)
+
+    assert FString.encode("ab") == b"\x03\x00\x00\x00ab\x00"
+    assert FString.encode("ab", True) == b"\xfd\xff\xff\xffa\x00b\x00\x00\x00"
+
+
 def test_locres_read():
     files = [
         "./tests/ver_0.locres",
@@ -82,3 +180,688 @@ def test_locres_write_and_readback():
                     entry.translation
                     == locres.namespaces[namespace.name][entry.key].translation
                 )
+
+
+def test_locres_lazy_read():
+    files = [
+        "./tests/ver_0.locres",
+        "./tests/ver_1.locres",
+        "./tests/ver_2.locres",
+        "./tests/ver_3.locres",
+    ]
+
+    for file in files:
+        eager = LocresFile()
+        eager.read(file)
+
+        with LocresFile() as locres:
+            locres.read(file, lazy=True)
+
+            for namespace in eager:
+                for entry in namespace:
+                    lazy_entry = locres[namespace.name][entry.key]
+                    assert lazy_entry.hash == entry.hash
+                    assert lazy_entry.translation == entry.translation
+
+            temp_file = "./tests/temp.locres"
+            locres.write(temp_file)
+
+        locres_readback = LocresFile()
+        locres_readback.read(temp_file)
+        assert locres_readback["third"]["key_3"].translation == "third"
+
+
+def test_locres_partial_read():
+    for version in LocresVersion:
+        file = f"./tests/ver_{version}.locres"
+        eager = LocresFile()
+        eager.read(file)
+
+        for lazy in [False, True]:
+            with LocresFile() as locres:
+                locres.read(file, lazy=lazy, namespaces=["second"])
+                assert [namespace.name for namespace in locres] == ["second"]
+                for entry in eager["second"]:
+                    partial = locres["second"][entry.key]
+                    assert partial.hash == entry.hash
+                    assert partial.translation == entry.translation
+
+            locres = LocresFile()
+            locres.read(
+                file,
+                lazy=lazy,
+                columnar=True,
+                key_filter=lambda name, key: name != "first" and key == "key_2",
+            )
+            assert [
+                (namespace.name, list(namespace.entrys)) for namespace in locres
+            ] == [("second", ["key_2"]), ("third", ["key_2"])]
+            expected = eager["third"]["key_2"].translation
+            assert locres["third"]["key_2"].translation == expected
+            locres.close()
+
+
+def test_locres_unicode_roundtrip():
+    for version in LocresVersion:
+        locres = LocresFile()
+        locres.version = version
+        namespace = Namespace("Меню")
+        namespace.add(Entry("ascii", "Play", 1))
+        namespace.add(Entry("ключ", "Грати", 2))
+        namespace.add(Entry("empty", "", 3))
+        locres.add(namespace)
+
+        locres_readback = LocresFile()
+        locres_readback.read(locres.to_binary())
+
+        assert locres_readback.version == version
+        assert locres_readback["Меню"]["ascii"].translation == "Play"
+        assert locres_readback["Меню"]["ключ"].translation == "Грати"
+        assert locres_readback["Меню"]["ключ"].hash == 2
+        assert locres_readback["Меню"]["empty"].translation == ""
+
+
+def test_locres_keeps_hashes_until_changed():
+    locres = LocresFile()
+    locres.read("./tests/ver_3.locres")
+    namespace = locres["first"]
+    entry = namespace["key_1"]
+
+    assert not namespace.dirty and not entry.dirty
+    stored_hash = entry._key_hash
+
+    entry.key = "renamed"
+    assert entry.dirty
+
+    locres.update_hashes()
+    assert not entry.dirty
+    assert entry._key_hash == CityHash.city_hash_64_utf16_to_uint32("renamed")
+    assert entry._key_hash != stored_hash
+
+    locres.version = LocresVersion.Optimized
+    locres.update_hashes()
+    assert entry._key_hash == str_crc32("renamed")
+    assert namespace._name_hash == str_crc32("first")
+
+
+def test_locres_writer_matches_locres_file():
+    for file in ["./tests/ver_0.locres", "./tests/ver_3.locres"]:
+        locres = LocresFile()
+        locres.read(file)
+
+        for version in LocresVersion:
+            locres.version = version
+            stream = io.BytesIO()
+            with LocresWriter(stream, version) as writer:
+                for namespace in locres:
+                    writer.begin_namespace(namespace.name)
+                    for entry in namespace:
+                        writer.add(entry.key, entry.hash, entry.translation)
+
+            assert stream.getvalue() == locres.to_binary()
+
+            # Entries may come from a generator
+            stream = io.BytesIO()
+            with LocresWriter(stream, version) as writer:
+                for namespace in locres:
+                    writer.write_namespace(
+                        namespace.name,
+                        ((e.key, e.hash, e.translation) for e in namespace),
+                    )
+            assert stream.getvalue() == locres.to_binary()
+
+
+def test_locres_write_sections():
+    for version in [LocresVersion.Optimized, LocresVersion.CityHash]:
+        locres = LocresFile()
+        locres.version = version
+        namespace = Namespace("UI")
+        namespace.add(Entry("PlayButton", "Play", entry_hash("Play")))
+        locres.add(namespace)
+
+        with BinWriter() as BW:
+            locres.write_header(BW)
+            locres.make_string_dict()
+            locres.write_keys(BW)
+            locres.write_text(BW)
+            data = BW.get_bytes()
+        assert data == locres.to_binary()
+
+
+def test_locres_write_to_stream(tmp_path):
+    class ShortWrites(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, data):
+            self.data += data[:7]
+            return min(len(data), 7)
+
+    for version in LocresVersion:
+        locres = LocresFile()
+        locres.read(f"./tests/ver_{version}.locres")
+        expected = locres.to_binary()
+
+        view = locres.to_binary(view=True)
+        assert isinstance(view, memoryview) and not view.readonly
+        assert view == expected
+
+        stream = ShortWrites()
+        locres.write(stream)
+        assert stream.data == expected
+
+        with zipfile.ZipFile(tmp_path / "pak.zip", "w") as archive:
+            with archive.open("Game.locres", "w") as member:
+                locres.write(member)
+        with zipfile.ZipFile(tmp_path / "pak.zip") as archive:
+            assert archive.read("Game.locres") == expected
+
+
+def test_iter_entries(tmp_path):
+    files = [
+        "./tests/ver_0.locres",
+        "./tests/ver_1.locres",
+        "./tests/ver_2.locres",
+        "./tests/ver_3.locres",
+    ]
+
+    for file in files:
+        locres = LocresFile()
+        locres.read(file)
+
+        expected = [
+            (namespace.name, entry.key, entry.hash, entry.translation)
+            for namespace in locres
+            for entry in namespace
+        ]
+        assert list(iter_entries(file)) == expected
+
+    # Mapped Legacy files are decoded string by string
+    locres = LocresFile()
+    locres.version = LocresVersion.Legacy
+    namespace = Namespace("UI")
+    namespace.add(Entry("Грати", "Play", 1))
+    namespace.add(Entry("Play", "Грати", 2))
+    namespace.add(Entry("", "", 3))
+    locres.add(namespace)
+    locres.write(tmp_path / "legacy.locres")
+    assert list(iter_entries(tmp_path / "legacy.locres")) == [
+        ("UI", "Грати", 1, "Play"),
+        ("UI", "Play", 2, "Грати"),
+        ("UI", "", 3, ""),
+    ]
+
+
+def test_locres_hash_index():
+    for file in ["./tests/ver_0.locres", "./tests/ver_2.locres", "./tests/ver_3.locres"]:
+        locres = LocresFile()
+        locres.read(file)
+        if locres.version < LocresVersion.Optimized:
+            locres.version = LocresVersion.CityHash
+        locres.update_hashes()
+
+        for lazy in [False, True]:
+            with LocresHashIndex.read(file, lazy=lazy) as index:
+                assert len(index) + index.collisions == sum(len(ns) for ns in locres)
+                for namespace in locres:
+                    for entry in namespace:
+                        assert index.lookup_by_hash(
+                            namespace._name_hash, entry._key_hash
+                        ) == (entry.hash, entry.translation)
+                        assert index.lookup(namespace.name, entry.key) == (
+                            entry.hash,
+                            entry.translation,
+                        )
+                assert index.lookup_by_hash(0, 0) is None
+
+            if lazy:
+                # A closed lazy index has no file left to decode from
+                with pytest.raises(ValueError):
+                    index.lookup("first", "key_1")
+
+
+def test_locres_columnar_read():
+    files = [
+        "./tests/ver_0.locres",
+        "./tests/ver_1.locres",
+        "./tests/ver_2.locres",
+        "./tests/ver_3.locres",
+    ]
+
+    for file in files:
+        eager = LocresFile()
+        eager.read(file)
+
+        for lazy in (False, True):
+            with LocresFile() as locres:
+                locres.read(file, lazy=lazy, columnar=True)
+
+                for namespace in eager:
+                    columnar_namespace = locres[namespace.name]
+                    assert list(columnar_namespace.entrys) == list(namespace.entrys)
+                    for entry in namespace:
+                        columnar_entry = columnar_namespace[entry.key]
+                        assert columnar_entry.hash == entry.hash
+                        assert columnar_entry.translation == entry.translation
+
+                assert locres.to_binary() == eager.to_binary()
+
+    locres = LocresFile()
+    locres.read("./tests/ver_3.locres", columnar=True)
+    namespace = locres["first"]
+    namespace["key_2"].translation = "changed"
+    namespace.remove("key_1")
+    namespace.add(Entry("key_4", "fourth", 4))
+
+    assert [entry.key for entry in namespace] == ["key_2", "key_3", "key_4"]
+    assert namespace["key_2"].translation == "changed"
+    assert namespace["key_3"].translation == "third"
+    assert namespace["key_4"].dirty and not namespace["key_3"].dirty
+
+    with pytest.raises(ValueError):
+        namespace["key_4"].key = "key_3"
+    namespace.remove("key_3")
+    assert [entry.key for entry in namespace] == ["key_2", "key_4"]
+
+    locres_readback = LocresFile()
+    locres_readback.read(locres.to_binary())
+    assert locres_readback["first"]["key_4"].translation == "fourth"
+    assert locres_readback["first"]["key_2"].translation == "changed"
+
+    # Views held across a removal stay on their own entry
+    locres = LocresFile()
+    locres.read("./tests/ver_3.locres", columnar=True)
+    namespace = locres["first"]
+    key_1, key_2 = namespace["key_1"], namespace["key_2"]
+    namespace.remove("key_1")
+    key_2.translation = "changed"
+    assert namespace["key_2"].translation == "changed"
+    assert namespace["key_3"].translation == "third"
+    with pytest.raises(KeyError):
+        key_1.translation
+
+    for entry in list(namespace):
+        namespace.remove(entry.key)
+    assert len(namespace) == 0
+
+
+def test_locres_patch():
+    files = [
+        "./tests/ver_1.locres",
+        "./tests/ver_2.locres",
+        "./tests/ver_3.locres",
+    ]
+
+    for file in files:
+        temp_file = "./tests/temp.locres"
+        changes = {
+            ("first", "key_1"): "перший",
+            ("second", "key_1"): "перший",
+            ("third", "key_2"): "first",
+            ("first", "key_3"): "3",
+            ("second", "key_3"): "3",
+            ("third", "key_3"): "3",
+        }
+        assert LocresFile.patch(file, changes, temp_file) == 6
+
+        expected = LocresFile()
+        expected.read(file)
+        for (name, key), translation in changes.items():
+            expected[name][key].translation = translation
+
+        locres = LocresFile()
+        locres.read(temp_file)
+        assert locres.version == expected.version
+        for namespace in expected:
+            for entry in namespace:
+                patched_entry = locres[namespace.name][entry.key]
+                assert patched_entry.translation == entry.translation
+                assert patched_entry.hash == entry.hash
+
+        with open(file, "rb") as original, open(temp_file, "rb") as patched:
+            assert original.read(17) == patched.read(17)
+
+        # Translations already in the table are not stored twice
+        translations = {e.translation for namespace in expected for e in namespace}
+        assert scan(temp_file).strings == len(translations)
+
+        # In place, through a temporary file
+        assert LocresFile.patch(temp_file, {("first", "key_2"): "second"}) == 1
+        locres.read(temp_file)
+        assert locres["first"]["key_2"].translation == "second"
+        assert not list(Path("./tests").glob("temp.locres.*.tmp"))
+
+
+def test_snapshot_cache(tmp_path):
+    for version in LocresVersion:
+        file = tmp_path / f"ver_{version}.locres"
+        file.write_bytes(Path(f"./tests/ver_{version}.locres").read_bytes())
+        expected = LocresFile()
+        expected.read(str(file))
+
+        cache = SnapshotCache(tmp_path / "cache")
+        for columnar in [False, True, False]:
+            locres = cache.read(file, columnar)
+            assert locres.version == expected.version
+            assert locres.to_binary() == expected.to_binary()
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        cache.invalidate(file)
+        locres = cache.read(file)
+        assert cache.misses == 2
+        assert all(isinstance(ns, ColumnarNamespace) for ns in locres)
+
+        # Same content under a new mtime is still a hit
+        os.utime(file, ns=(0, 0))
+        assert cache.read(file).to_binary() == expected.to_binary()
+        assert (cache.hits, cache.misses) == (3, 2)
+
+        # A corrupt snapshot behind a valid header is replaced like a miss
+        snapshot = cache.snapshot_path(file)
+        snapshot.write_bytes(snapshot.read_bytes()[:-3])
+        assert cache.read(file).to_binary() == expected.to_binary()
+        assert (cache.hits, cache.misses) == (3, 3)
+        assert cache.read(file).to_binary() == expected.to_binary()
+        assert cache.hits == 4
+
+    cache.max_size = 0
+    cache.evict()
+    assert not list((tmp_path / "cache").iterdir())
+
+
+def test_async_read_and_write(tmp_path):
+    files = [f"./tests/ver_{version}.locres" for version in LocresVersion]
+
+    async def main():
+        locres_files = await LocresFile.aread_many(files)
+        await asyncio.gather(
+            *(
+                locres.awrite(tmp_path / f"{i}.locres")
+                for i, locres in enumerate(locres_files)
+            )
+        )
+        locmeta = LocmetaFile(compiled_cultures=["en", "uk"])
+        await locmeta.awrite(tmp_path / "Game.locmeta")
+        return await LocmetaFile.aread(tmp_path / "Game.locmeta")
+
+    locmeta = asyncio.run(main())
+    assert locmeta.compiled_cultures == ["en", "uk"]
+
+    locres = asyncio.run(
+        LocresFile.aread(
+            files[-1],
+            namespaces={"first"},
+            key_filter=lambda namespace, key: key == "key_2",
+        )
+    )
+    assert list(locres.namespaces) == ["first"]
+    assert [entry.key for entry in locres["first"]] == ["key_2"]
+
+    for i, file in enumerate(files):
+        expected = LocresFile()
+        expected.read(file)
+        assert (tmp_path / f"{i}.locres").read_bytes() == expected.to_binary()
+
+    stream = io.BytesIO()
+    asyncio.run(expected.awrite(stream))
+    assert stream.getvalue() == expected.to_binary()
+
+    # Only the default pool is shut down when replaced
+    default = aio.get_executor()
+    with ThreadPoolExecutor(1) as mine:
+        aio.set_executor(mine)
+        assert default._shutdown
+        aio.set_executor(None)
+        assert mine.submit(len, "abc").result() == 3
+    assert aio.get_executor() is not default
+
+
+def test_locres_collection(tmp_path):
+    native = LocresFile()
+    native.read("./tests/ver_3.locres")
+    (tmp_path / "en").mkdir()
+    native.write(str(tmp_path / "en" / "Game.locres"))
+
+    # A culture missing the last key of every namespace
+    (tmp_path / "uk").mkdir()
+    with LocresWriter(tmp_path / "uk" / "Game.locres") as writer:
+        for namespace in native:
+            writer.begin_namespace(namespace.name)
+            for entry in list(namespace)[:-1]:
+                writer.add(entry.key, entry.hash, "uk " + entry.translation)
+
+    LocmetaFile(compiled_cultures=["uk", "en"]).write(str(tmp_path / "Game.locmeta"))
+
+    for jobs in [1, 2]:
+        collection = LocresCollection.from_locmeta(tmp_path / "Game.locmeta", jobs=jobs)
+        assert collection.cultures == ["en", "uk"]
+        assert len(collection) == sum(len(namespace) for namespace in native)
+
+        for namespace in native:
+            entries = list(namespace)
+            for entry in entries:
+                assert collection[namespace.name, entry.key, "en"] == entry.translation
+            assert collection[namespace.name, entries[0].key, "uk"] == (
+                "uk " + entries[0].translation
+            )
+            assert collection[namespace.name, entries[-1].key, "uk"] is None
+
+    collection.write_all(tmp_path / "out")
+    for culture in collection.cultures:
+        written = (tmp_path / "out" / culture / "Game.locres").read_bytes()
+        assert written == (tmp_path / culture / "Game.locres").read_bytes()
+        assert collection.to_locres(culture).to_binary() == written
+
+    collection["UI", "NewKey", "uk"] = "Нове"
+    stream = io.BytesIO()
+    collection.write("uk", stream)
+    locres = LocresFile()
+    locres.read(stream.getvalue())
+    assert locres["UI"]["NewKey"].translation == "Нове"
+
+
+def test_verify(tmp_path, monkeypatch):
+    results = verify_batch("./tests/ver_*.locres", jobs=1)
+    assert [result.ok for result in results] == [True] * 4
+
+    path = tmp_path / "bad.locres"
+    with LocresWriter(path) as writer:
+        writer.begin_namespace("UI")
+        writer.add("Play", 1, "Play", key_hash=7)
+        writer.add("Quit", 2, "Quit", key_hash=7)
+        writer.add("Back", 3, "Back")
+
+    source = tmp_path / "source.locres"
+    with LocresWriter(source) as writer:
+        writer.begin_namespace("UI")
+        writer.add("Play", 1, "Play")
+        writer.add("Back", 4, "Back")
+
+    # Hash in batches of two strings on a pool
+    monkeypatch.setattr("pylocres.verify.BATCH_SIZE", 2)
+    with ThreadPoolExecutor(2) as executor:
+        result = verify(path, source, executor)
+
+    assert not result.ok
+    assert result.entries == 3
+    assert [(m.kind, m.key, m.stored) for m in result.mismatches] == [
+        ("key", "Play", 7),
+        ("key", "Quit", 7),
+        ("source", "Back", 3),
+    ]
+    assert result.collisions == [(7, "UI", "Quit", "Play")]
+
+
+def test_diff():
+    for old_version in LocresVersion:
+        for new_version in LocresVersion:
+            old = LocresFile()
+            old.read("./tests/ver_3.locres")
+            old.version = old_version
+            new = LocresFile()
+            new.read("./tests/ver_3.locres")
+            new.version = new_version
+
+            namespaces = list(new)
+            entries = list(namespaces[0])
+            entries[0].translation = "Changed"
+            entries[1].hash = 12345
+            namespaces[0].remove(entries[2].key)
+            namespaces[-1].add(Entry("NewKey", "Нове", 5))
+
+            expected = [
+                ("changed", entries[0].key, "Changed"),
+                ("source", entries[1].key, None),
+                ("added", "NewKey", "Нове"),
+                ("removed", entries[2].key, None),
+            ]
+            for changes in [
+                diff(old.to_binary(), new.to_binary()),
+                diff(old, new),
+            ]:
+                assert [
+                    (change.change, change.key, change.new_translation)
+                    for change in changes
+                ] == expected
+
+
+def test_csv_roundtrip(tmp_path):
+    for version in LocresVersion:
+        locres = LocresFile()
+        locres.read(f"./tests/ver_{version}.locres")
+        csv_path = tmp_path / f"{version}.csv"
+        locres_to_csv(f"./tests/ver_{version}.locres", csv_path)
+        lines = csv_path.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "key,hash,source,translation"
+        assert lines[1].startswith('"first,key_1",') and lines[1].endswith(",,first")
+
+        for grouped in [False, True]:
+            out = tmp_path / f"{version}.locres"
+            csv_to_locres(csv_path, out, version, grouped=grouped)
+            assert out.read_bytes() == locres.to_binary()
+
+    # A namespace split over the file cannot be written grouped
+    lines = csv_path.read_text(encoding="utf-8").splitlines()
+    csv_path.write_text("\n".join(lines + lines[1:2]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        csv_to_locres(csv_path, tmp_path / "split.locres", grouped=True)
+
+
+def test_po_roundtrip(tmp_path):
+    messages = [
+        ("UI,Play", "Play", ""),
+        ("UI,Quote", 'Say "hi"\\now\tplease', "Скажи"),
+        ("UI,Lines", "first\nsecond\r\nthird\n", ""),
+        ("UI,Long", "word " * 40, "слово " * 40),
+    ]
+    po_path = tmp_path / "messages.po"
+    with PoWriter(po_path) as writer:
+        for message in messages:
+            writer.add(*message)
+    text = po_path.read_text(encoding="utf-8")
+    assert text.startswith('#\nmsgid ""\nmsgstr ""\n\nmsgctxt "UI,Play"\n')
+    assert 'msgid ""\n"first\\n"\n"second\\r\\n"\n"third\\n"\n' in text
+    assert max(len(line) for line in text.splitlines()) <= 78
+    assert list(iter_po(po_path)) == messages
+
+    for version in LocresVersion:
+        locres = LocresFile()
+        locres.read(f"./tests/ver_{version}.locres")
+        locres_to_po(f"./tests/ver_{version}.locres", po_path)
+        out = tmp_path / f"{version}.locres"
+        assert po_to_locres(po_path, out, version) == []
+        grouped = tmp_path / f"{version}_grouped.locres"
+        assert po_to_locres(po_path, grouped, version, grouped=True) == []
+        assert grouped.read_bytes() == out.read_bytes()
+
+        result = LocresFile()
+        result.read(out)
+        for namespace in locres:
+            for entry in namespace:
+                converted = result[namespace.name][entry.key]
+                assert converted.translation == entry.translation
+                assert converted.hash == str_crc32(entry.translation)
+
+    with open(po_path, "a", encoding="utf-8") as f:
+        f.write('\nmsgid "no context"\nmsgstr ""\n')
+    assert po_to_locres(po_path, tmp_path / "skipped.locres") == [None]
+
+
+def test_convert_batch(tmp_path):
+    for culture, file in (("en", "./tests/ver_3.locres"), ("de", "./tests/ver_1.locres")):
+        (tmp_path / "Game" / culture).mkdir(parents=True)
+        with open(file, "rb") as src:
+            (tmp_path / "Game" / culture / "Game.locres").write_bytes(src.read())
+
+    results = convert_batch(tmp_path / "Game", "to-csv", tmp_path / "csv", jobs=2)
+    assert [result.error for result in results] == [None, None]
+
+    results = convert_batch(str(tmp_path / "csv" / "*" / "*.csv"), "from-csv", jobs=1)
+    assert sorted(Path(result.out).parent.name for result in results) == ["de", "en"]
+
+    locres = LocresFile()
+    locres.read(tmp_path / "csv" / "de" / "Game.locres")
+    assert locres["third"]["key_2"].translation == "second"
+
+    # Glob patterns only pick up files with the input suffix
+    files = find_files(tmp_path / "csv" / "*" / "*", ".csv")
+    assert [file.name for file in files] == ["Game.csv", "Game.csv"]
+
+    # Inputs are never overwritten when both sides are .locres files
+    en = tmp_path / "Game" / "en" / "Game.locres"
+    original = en.read_bytes()
+    results = convert_batch(en, "fix-hashes", jobs=1, source_file=en)
+    assert results[0].out == str(en.with_name("Game.fixed.locres"))
+    assert en.read_bytes() == original
+    with pytest.raises(ValueError):
+        convert_batch(en, "fix-hashes", en.parent, source_file=en)
+
+
+def test_scan():
+    for version in LocresVersion:
+        locres = LocresFile()
+        locres.read(f"./tests/ver_{version}.locres")
+        locres.make_string_dict()
+
+        result = scan(f"./tests/ver_{version}.locres", stats=True, largest=2)
+        assert result.version == version
+        assert result.namespaces == len(locres) == 3
+        assert result.entries == sum(len(namespace) for namespace in locres) == 9
+        if version >= LocresVersion.Compact:
+            assert result.strings == len(locres._strings) == 3
+            assert result.dedup_ratio == 3.0
+        assert result.string_stats.ascii == result.strings
+        assert result.string_stats.utf16 == 0
+        assert result.string_stats.largest[0] == (6, "second")
+        assert scan(f"./tests/ver_{version}.locres").string_stats is None
+
+    locres = LocresFile()
+    namespace = Namespace("UI")
+    namespace.add(Entry("a", "Грати", "Play", False))
+    namespace.add(Entry("b", "Play", "Play", False))
+    locres.add(namespace)
+    strings = scan(locres.to_binary(), stats=True).string_stats
+    assert (strings.ascii, strings.utf16) == (1, 1)
+    assert strings.utf16_bytes == 12
+
+
+def test_locres_stats():
+    calls = []
+    stats = LocresStats(hook=lambda phase, seconds, size: calls.append(phase))
+
+    locres = LocresFile()
+    locres.stats = stats
+    locres.read("./tests/ver_3.locres")
+    assert calls == ["read_header", "read_strings", "read_keys"]
+    assert stats.counters == {"strings": 3, "namespaces": 3, "entries": 9}
+
+    stats.reset()
+    locres["first"]["key_1"].key = "renamed"
+    locres.to_binary()
+    assert stats.counters["hashes"] == 1
+    assert stats.counters["duplicates"] == 6
+    assert stats.phases["write_keys"]["bytes"] > 0
+    assert "update_hashes" in stats.report()